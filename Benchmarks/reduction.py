@@ -0,0 +1,78 @@
+import random
+import time
+
+from ECCBackend.curves.prime_field import PrimeField
+from ECCBackend.curves.reduction import Reduction, special_form_reductions
+from ECCData.preset_curves import CurveDB, get_curve
+
+PRODUCTS = 2000
+SCALAR_MULTIPLICATIONS = 10
+REPEAT = 7
+
+
+def best_time(function) -> float:
+    """ Минимальное время выполнения function из REPEAT запусков. """
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def reduction_gain(modulus: int, reduction) -> float:
+    """ Во сколько раз reduction быстрее встроенного деления на случайных
+        произведениях.
+    """
+    products = [random.randrange(modulus) * random.randrange(modulus)
+                for _ in range(PRODUCTS)]
+    generic = Reduction(modulus).reduce
+    special = reduction.reduce
+    assert all(generic(x) == special(x) for x in products)
+    return best_time(lambda: [generic(x) for x in products]) / \
+        best_time(lambda: [special(x) for x in products])
+
+
+def multiplication_gain(curve, reduction) -> float:
+    """ Во сколько раз быстрее умножение точки на скаляр в поле со
+        стратегией reduction, чем со встроенным делением.
+    """
+    point = random.randrange(1, curve.order) * curve.gen
+    scalars = [random.randrange(1, curve.order)
+               for _ in range(SCALAR_MULTIPLICATIONS)]
+    curve_field = curve.field
+    timings = []
+    for field in (PrimeField(curve.modulus, Reduction(curve.modulus)),
+                  PrimeField(curve.modulus, reduction)):
+        curve._field = field
+        timings.append(best_time(lambda: [point * k for k in scalars]))
+    curve._field = curve_field
+    return timings[0] / timings[1]
+
+
+def main():
+    """ Для каждой кривой с модулем специального вида сравнивает сдвиговое
+        приведение со встроенным делением и показывает, какая стратегия
+        выбрана полем кривой.
+    """
+    print('%-24s %-16s %-16s %8s %8s' %
+          ('curve', 'form', 'selected', 'reduce', 'k * P'))
+    for name in CurveDB().curve_names():
+        curve = get_curve(name)
+        modulus = curve.modulus
+        form = next((cls for cls in special_form_reductions()
+                     if cls.has_form(modulus)), None)
+        if form is None:
+            print('%-24s %-16s %-16s %8s %8s' %
+                  (name, '-', curve.field.reduction.name, '-', '-'))
+            continue
+        reduction = form(modulus)
+        print('%-24s %-16s %-16s %7.2fx %7.2fx' % (
+            name, form.name, curve.field.reduction.name,
+            reduction_gain(modulus, reduction),
+            multiplication_gain(curve, reduction)
+        ))
+
+
+if __name__ == '__main__':
+    main()
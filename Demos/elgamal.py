@@ -1,3 +1,4 @@
+from ECCBackend.keys.ephemeral_pool import draw_ephemeral
 from ECCBackend.keys.private_key import ECPrivateKey
 from ECCData.preset_curves import get_curve
 
@@ -16,8 +17,8 @@ def msg_to_point(curve, msg, msg_width_bits):
 
 
 def elgamal_encrypt(recipient_public_key, msg, msg_width_bits, curve):
-    k = ECPrivateKey.generate(curve)
-    c1 = k.pubkey.point
+    k = draw_ephemeral(curve)
+    c1 = k.point
     c2 = k.scalar * recipient_public_key.point
     p_m = msg_to_point(curve, msg, msg_width_bits=msg_width_bits)
     ciphertext = c1, c2 + p_m
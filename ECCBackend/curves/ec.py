@@ -1,14 +1,34 @@
 from ECCBackend.curves.point import Point
+from ECCBackend.curves.prime_field import PrimeField
+from ECCBackend.curves.scalar_recoding import optimal_wnaf_width
+from ECCBackend.primes import factorize
 
 
 class EllipticCurve:
+    # ширина окна таблицы предвычислений для генератора по умолчанию
+    DEFAULT_GEN_TABLE_WIDTH = 4
+
+    # до какой длины модуля в битах curve_order сам считает #E(F_p); для
+    # больших модулей подсчёт запускается только явно (compute_curve_order)
+    AUTO_CURVE_ORDER_MAX_BITS = 20
+
     def __init__(self, modulus: int, order: int = None, cofactor: int = None,
                  gen_x: int = None, gen_y: int = None, **kwargs):
         assert ((gen_x is None) == (gen_y is None))
 
         self._modulus = modulus
+        self._field = PrimeField.get(modulus)
         self._order = order
         self._cofactor = cofactor
+        self._curve_order = None
+        self._curve_order_factors = None
+        self._gen_order = None
+        self._name = kwargs.get('name')
+        self._gen_table_width = kwargs.get(
+            'gen_table_width', self.DEFAULT_GEN_TABLE_WIDTH
+        )
+        self._gen_table = None
+        self._nonce_pool = None
 
         if (gen_x is not None) and (gen_y is not None):
             self._gen = Point(gen_x, gen_y, self)
@@ -19,6 +39,16 @@ class EllipticCurve:
     def modulus(self):
         return self._modulus
 
+    @property
+    def field(self):
+        """ Базовое поле кривой. """
+        return self._field
+
+    @property
+    def coordinate_length(self):
+        """ Длина координаты точки в байтах (SEC1). """
+        return (self._modulus.bit_length() + 7) // 8
+
     @property
     def order(self):
         return self._order
@@ -31,12 +61,126 @@ class EllipticCurve:
     def gen(self):
         return self._gen
 
+    @property
+    def nonce_pool(self):
+        """ Пул эфемерных скаляров (см. EphemeralPool), из которого берут
+            nonce подпись и шифрование; None — nonce вычисляются на месте.
+        """
+        return self._nonce_pool
+
+    @nonce_pool.setter
+    def nonce_pool(self, pool):
+        assert ((pool is None) or (pool.curve is self))
+        self._nonce_pool = pool
+
+    @property
+    def gen_table_width(self):
+        """ Ширина окна таблицы предвычислений для генератора; 0 — таблица
+            не используется. Таблица занимает около
+            (order.bit_length() / width) * (2^width - 1) точек.
+        """
+        return self._gen_table_width
+
+    @gen_table_width.setter
+    def gen_table_width(self, width: int):
+        assert (width >= 0)
+        self._gen_table_width = width
+        self._gen_table = None
+
+    @property
+    def gen_table(self):
+        """ Таблица предвычислений для генератора, строится при первом
+            обращении.
+        """
+        table = self._gen_table
+        if table is None:
+            table = self._build_gen_table(self.gen_table_width)
+            self._gen_table = table
+        return table
+
+    def _build_gen_table(self, width: int):
+        raise Exception(NotImplemented)
+
+    @property
+    def wnaf_width(self):
+        """ Ширина окна width-NAF для умножения произвольной точки на
+            скаляр, подобранная по битовой длине поля.
+        """
+        return optimal_wnaf_width(self.modulus.bit_length())
+
     @property
     def curve_order(self):
-        """ Порядок эллиптической кривой. """
-        if (self.cofactor is None) or (self.order is None):
-            raise Exception('#E(F_p) is unknown for this curve')
-        return self.cofactor * self.order
+        """ Порядок эллиптической кривой. Если порядок генератора или
+            кофактор не заданы, #E(F_p) берётся из compute_curve_order; сам
+            подсчёт запускается при первом обращении только для модулей не
+            длиннее AUTO_CURVE_ORDER_MAX_BITS бит, иначе бросается
+            исключение.
+        """
+        if (self.cofactor is not None) and (self.order is not None):
+            return self.cofactor * self.order
+        if self._curve_order is None:
+            if self.modulus.bit_length() > self.AUTO_CURVE_ORDER_MAX_BITS:
+                raise Exception(
+                    '#E(F_p) is unknown for this curve; '
+                    'call compute_curve_order() to count points'
+                )
+            self.compute_curve_order()
+        return self._curve_order
+
+    def compute_curve_order(self, **kwargs) -> int:
+        """ Вычисляет #E(F_p) (см. count_curve_order) и запоминает его
+            для curve_order. Для больших модулей может занять минуты.
+        """
+        if (self.cofactor is not None) and (self.order is not None):
+            return self.cofactor * self.order
+        if self._curve_order is None:
+            self._curve_order = self.count_curve_order(**kwargs)
+        return self._curve_order
+
+    def count_curve_order(self, **kwargs) -> int:
+        """ Подсчёт #E(F_p) без заданных параметров кривой. """
+        return self.naive_order_calculation()
+
+    @property
+    def curve_order_factors(self):
+        """ Разложение #E(F_p) на простые множители {простое: степень},
+            вычисляется при первом обращении (см. factorize).
+        """
+        if self._curve_order_factors is None:
+            self._curve_order_factors = factorize(self.curve_order)
+        return self._curve_order_factors
+
+    def point_order(self, point) -> int:
+        """ Порядок точки point: из #E(F_p) по очереди удаляются
+            простые множители q^e, после чего q добавляется обратно, пока
+            кратное точки не станет нейтральным (не больше e раз). Порядок
+            генератора запоминается на кривой. ValueError, если точка не
+            лежит на кривой либо #E * point != O.
+        """
+        if point.is_neutral:
+            return 1
+        if not self.on_curve(point):
+            raise ValueError('Point is not on the curve.')
+        is_gen = self.has_generator and point == self.gen
+        if is_gen:
+            if self.order is not None:
+                return self.order
+            if self._gen_order is not None:
+                return self._gen_order
+        order = self.curve_order
+        for prime, exponent in self.curve_order_factors.items():
+            order //= prime ** exponent
+            multiple = point * order
+            for _ in range(exponent):
+                if multiple.is_neutral:
+                    break
+                multiple = multiple * prime
+                order *= prime
+            if not multiple.is_neutral:
+                raise ValueError('#E(F_p) does not annihilate the point.')
+        if is_gen:
+            self._gen_order = order
+        return order
 
     @property
     def frobenius_trace(self):
@@ -57,7 +201,7 @@ class EllipticCurve:
 
     @property
     def name(self):
-        return self.name
+        return self._name
 
     @property
     def domain_param_dict(self):
@@ -82,6 +226,10 @@ class EllipticCurve:
         """ Нейтральный элемент группы кривой. """
         return Point(None, None, self)
 
+    def point(self, x: int, y: int):
+        """ Точка кривой с заданными аффинными координатами. """
+        return Point(x, y, self)
+
     def is_neutral(self, point):
         """ True, если point — нейтральный элемент, иначе False. """
         return point.x is None
@@ -90,6 +238,10 @@ class EllipticCurve:
         """ True, если точка point лежит на данной кривой, иначе False. """
         raise Exception(NotImplemented)
 
+    def decode_point(self, data: bytes):
+        """ Точка из кодировки SEC1 (см. Point.encode). """
+        raise Exception(NotImplemented)
+
     def point_conjugate(self, point):
         """ Возвращает точку -point для данной точки point. """
         raise Exception(NotImplemented)
@@ -98,6 +250,24 @@ class EllipticCurve:
         """ Возвращает результат сложения двух точек. """
         raise Exception(NotImplemented)
 
+    def point_multiplication(self, point, scalar: int):
+        """ Умножение точки на скаляр методом "удвоение-сложение". """
+        result = self.neutral()
+        n = point
+        if scalar > 0:
+            for bit in range(scalar.bit_length()):
+                if scalar & (1 << bit):
+                    result += n
+                n += n
+        return result
+
+    def multi_scalar_mul(self, terms):
+        """ Сумма k_1 * P_1 + ... + k_n * P_n для пар (k_i, P_i). """
+        result = self.neutral()
+        for scalar, point in terms:
+            result += self.point_multiplication(point, scalar)
+        return result
+
     def __eq__(self, other):
         return self.domain_params == other.domain_params
 
@@ -0,0 +1,109 @@
+import collections
+import math
+
+from ECCBackend.primes import is_probable_prime
+
+_GLVParameters = collections.namedtuple(
+    'GLVParameters', ['beta', 'lam', 'a1', 'b1', 'a2', 'b2']
+)
+
+
+class GLVEndomorphism:
+    """ Ускорение умножения на скаляр эндоморфизмом phi(x, y) = (beta x, y)
+        кривых y^2 = x^3 + b над F_p, p = 1 mod 3 (Галлант, Ламберт,
+        Ванстоун). На подгруппе порядка n phi(P) = lambda P, поэтому
+        k P = k1 P + k2 phi(P), где k1, k2 — половинной длины.
+    """
+    def _setup_glv(self):
+        """ Параметры GLV либо None, если кривая не подходит: нужен a = 0,
+            p = 1 mod 3, известный простой порядок n = 1 mod 3 генератора и
+            кофактор 1, чтобы phi(P) = lambda P выполнялось для всех точек.
+        """
+        p, n = self.modulus, self.order
+        if not (self._a_is_zero and (p % 3) == 1 and self.has_generator):
+            return None
+        if (n is None) or (self.cofactor != 1) or ((n % 3) != 1) or \
+                not is_probable_prime(n):
+            return None
+
+        beta = self._cube_root_of_unity(p)
+        lam = self._cube_root_of_unity(n)
+        # из двух нетривиальных корней lambda берём тот, что согласован
+        # с beta на генераторе
+        gen_x, gen_y = int(self.gen.x), int(self.gen.y)
+        for candidate in (lam, lam * lam % n):
+            image = self.jacobian_to_affine(
+                self.jacobian_wnaf_multiply(self.gen, candidate)
+            )
+            if image == (beta * gen_x % p, gen_y):
+                return _GLVParameters(beta, candidate,
+                                      *self._glv_basis(n, candidate))
+        return None
+
+    @staticmethod
+    def _cube_root_of_unity(modulus: int) -> int:
+        """ Нетривиальный кубический корень из единицы по простому модулю
+            modulus = 1 mod 3.
+        """
+        for g in range(2, modulus):
+            root = pow(g, (modulus - 1) // 3, modulus)
+            if root != 1:
+                return root
+
+    @staticmethod
+    def _glv_basis(n: int, lam: int) -> tuple:
+        """ Короткий базис (a1, b1), (a2, b2) решётки {(x, y) :
+            x + y lambda = 0 mod n} расширенным алгоритмом Евклида
+            (алгоритм 3.74 из "Guide to Elliptic Curve Cryptography").
+        """
+        sqrt_n = math.isqrt(n)
+        r0, r1 = n, lam
+        t0, t1 = 0, 1
+        while r1 >= sqrt_n:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            t0, t1 = t1, t0 - q * t1
+        a1, b1 = r1, -t1
+        q = r0 // r1
+        r2, t2 = r0 - q * r1, t0 - q * t1
+        if r0 * r0 + t0 * t0 <= r2 * r2 + t2 * t2:
+            a2, b2 = r0, -t0
+        else:
+            a2, b2 = r2, -t2
+        return a1, b1, a2, b2
+
+    @property
+    def has_glv(self):
+        """ True, если умножение на скаляр использует эндоморфизм GLV. """
+        return self._glv is not None
+
+    def glv_split(self, scalar: int) -> tuple:
+        """ Раскладывает скаляр в k1 + k2 lambda = k mod n с k1, k2
+            порядка sqrt(n); k1 и k2 могут быть отрицательными.
+        """
+        n = self.order
+        glv = self._glv
+        # округление b k / n до ближайшего целого
+        c1 = (2 * glv.b2 * scalar + n) // (2 * n)
+        c2 = (-2 * glv.b1 * scalar + n) // (2 * n)
+        k1 = scalar - c1 * glv.a1 - c2 * glv.a2
+        k2 = -c1 * glv.b1 - c2 * glv.b2
+        return k1, k2
+
+    def endomorphism(self, point):
+        """ phi(x, y) = (beta x, y) = lambda (x, y). """
+        if point.is_neutral:
+            return point
+        return self.point(self.field.mul(self._glv.beta, int(point.x)),
+                          int(point.y))
+
+    def _glv_terms(self, scalar: int, point) -> list:
+        """ Пары (k1, P), (k2, phi(P)) с неотрицательными скалярами для
+            умножения методом Штрауса.
+        """
+        k1, k2 = self.glv_split(scalar % self.order)
+        image = self.endomorphism(point)
+        return [
+            (k1, point) if k1 >= 0 else (-k1, -point),
+            (k2, image) if k2 >= 0 else (-k2, -image),
+        ]
@@ -1,16 +1,38 @@
-import random
+from ECCBackend.curves.prime_field import PrimeField
+
+
+def batch_inverse(values, modulus: int) -> list:
+    """ Обращает все ненулевые вычеты values по модулю modulus трюком
+        Монтгомери: 3(n - 1) умножений и одно обращение.
+    """
+    return PrimeField.get(modulus).batch_inv(values)
 
 
 class FieldElement:
+    __slots__ = ('_value', '_modulus')
+
     def __init__(self, value: int, modulus: int):
         self._value = value % modulus
         self._modulus = modulus
-        self._qnr = None
+
+    def _new(self, value: int):
+        """ Элемент того же поля; приведение по модулю выполняется, только
+            если value вне [0, modulus).
+        """
+        modulus = self._modulus
+        element = FieldElement.__new__(FieldElement)
+        element._value = value if 0 <= value < modulus else value % modulus
+        element._modulus = modulus
+        return element
 
     @property
     def modulus(self) -> int:
         return self._modulus
 
+    @property
+    def field(self) -> PrimeField:
+        return PrimeField.get(self._modulus)
+
     @staticmethod
     def _extended_euclidian_algorithm(a: int, b: int) -> tuple:
         """ Возвращает НОД и коэффициенты Безу. """
@@ -25,24 +47,34 @@ class FieldElement:
         return a, u, v
 
     def inverse(self):
-        if int(self) == 0:
+        if self._value == 0:
             raise ZeroDivisionError('Impossible inverse.')
-        gcd, u, v = \
-            self._extended_euclidian_algorithm(int(self), self.modulus)
-        return FieldElement(v, self.modulus)
+        return self._new(pow(self._value, -1, self._modulus))
+
+    @staticmethod
+    def batch_inverse(elements) -> list:
+        """ Обращает список элементов одного поля с одним обращением. """
+        if not elements:
+            return []
+        modulus = elements[0].modulus
+        if any(e.modulus != modulus for e in elements):
+            raise Exception(
+                'Cannot perform meaningful arithmetic operations '
+                'on field elements in different fields.'
+            )
+        inverses = batch_inverse([int(e) for e in elements], modulus)
+        return [FieldElement(value, modulus) for value in inverses]
 
     @property
     def is_qr(self) -> bool:
-        """ True, если квадратичный вычет по критерию Эйлера, иначе False. """
+        """ True, если квадратичный вычет (символ Якоби), иначе False. """
         return not self.is_qnr
 
     @property
     def is_qnr(self) -> bool:
-        """ True, если не квадратичный невычет по критерию Эйлера, иначе False.
+        """ True, если не квадратичный невычет (символ Якоби), иначе False.
         """
-        if self._qnr is None:
-            self._qnr = int(self ** ((self._modulus - 1) // 2)) != 1
-        return self._qnr
+        return not self.field.is_qr(self._value)
 
     @property
     def legrende_symbol(self) -> int:
@@ -50,42 +82,7 @@ class FieldElement:
             1, если квадратичный вычет;
             -1, если квадратичный невычет.
         """
-        if self == 0:
-            return 0
-        if self.is_qr:
-            return 1
-        return -1
-
-    def _tonelli_shanks_sqrt(self):
-        q = self._modulus - 1
-        s = 0
-        while (q % 2) == 0:
-            s += 1
-            q >>= 1
-        assert (q * (2 ** s) == self.modulus - 1)
-
-        while True:
-            z = FieldElement(random.randint(1, self.modulus - 1), self.modulus)
-            if z.is_qnr:
-                break
-        assert z.is_qnr
-        c = z ** q
-
-        r = self ** ((q + 1) // 2)
-        t = self ** q
-        m = s
-        while int(t) != 1:
-            for i in range(1, m):
-                if int(t ** (1 << i)) == 1:
-                    break
-
-            b = c ** (1 << (m - i - 1))
-            r = r * b
-            t = t * (b ** 2)
-            c = b ** 2
-            m = i
-
-        return r
+        return self.field.legendre(self._value)
 
     def sqrt(self):
         """ Возвращает квадратичный корень value либо None, если value –
@@ -94,27 +91,24 @@ class FieldElement:
         if self.is_qnr:
             return None
 
-        if (self._modulus % 4) == 3:
-            root = self ** ((self._modulus + 1) // 4)
-            assert (root * root == self)
-        else:
-            root = self._tonelli_shanks_sqrt()
-
+        root = self._new(self.field.sqrt(self._value))
         if (int(root) & 1) == 0:
             return root, -root
         return -root, root
 
     def __checktype(self, value):
-        if isinstance(value, int):
+        if type(value) is int:
             return value
         elif isinstance(value, FieldElement):
-            if value.modulus == self.modulus:
-                return int(value)
+            if value._modulus == self._modulus:
+                return value._value
             else:
                 raise Exception(
                     'Cannot perform meaningful arithmetic operations '
                     'on field elements in different fields.'
                 )
+        elif isinstance(value, int):
+            return value
 
     def __int__(self):
         return self._value
@@ -123,33 +117,31 @@ class FieldElement:
         value = self.__checktype(value)
         if value is None:
             return NotImplemented
-        return FieldElement(int(self) + value, self.modulus)
+        return self._new(self._value + value)
 
     def __sub__(self, value):
         value = self.__checktype(value)
         if value is None:
             return NotImplemented
-        return FieldElement(int(self) - value, self.modulus)
+        return self._new(self._value - value)
 
     def __mul__(self, value):
         value = self.__checktype(value)
         if value is None:
             return NotImplemented
-        return FieldElement(int(self) * value, self.modulus)
+        return self._new(self._value * value)
 
     def __floordiv__(self, value):
         value = self.__checktype(value)
         if value is None:
             return NotImplemented
-        return self * FieldElement(value, self.modulus).inverse()
+        return self._new(self._value * self.field.inv(value))
 
     def __pow__(self, exponent: int):
-        return FieldElement(
-            pow(int(self), exponent, self.modulus), self.modulus
-        )
+        return self._new(pow(self._value, exponent, self._modulus))
 
     def __neg__(self):
-        return FieldElement(-int(self), self.modulus)
+        return self._new(-self._value)
 
     def __radd__(self, value):
         return self + value
@@ -167,14 +159,14 @@ class FieldElement:
         if value is None:
             return False
         value = self.__checktype(value)
-        return int(self) == (value % self.modulus)
+        return self._value == (value % self._modulus)
 
     def __ne__(self, other):
         return not (self == other)
 
     def __lt__(self, value):
         value = self.__checktype(value)
-        return int(self) < value
+        return self._value < value
 
     def __hash__(self):
         return hash((self._value, self._modulus))
@@ -0,0 +1,446 @@
+from ECCBackend.curves.scalar_recoding import optimal_pippenger_window, \
+    signed_window_digits, wnaf
+
+
+class JacobianArithmetic:
+    """ Арифметика точек в якобиевых координатах (X : Y : Z), где
+        x = X / Z^2, y = Y / Z^3. Точки хранятся как кортежи целых чисел,
+        нейтральный элемент — любая тройка с Z = 0. Сложение и удвоение не
+        требуют обращений в поле, единственное обращение выполняется при
+        переходе обратно к аффинной точке. Вычисления идут в PrimeField
+        кривой: произведения приводятся через field.reduce.
+    """
+    JACOBIAN_NEUTRAL = (1, 1, 0)
+
+    # с какого числа слагаемых сумма k_i * P_i считается методом Пиппенджера
+    PIPPENGER_MIN_TERMS = 64
+
+    def to_jacobian(self, point):
+        """ Аффинная точка -> якобиевы координаты. """
+        if point.is_neutral:
+            return self.JACOBIAN_NEUTRAL
+        return int(point.x), int(point.y), 1
+
+    def jacobian_to_affine(self, jpoint):
+        """ Якобиевы координаты -> пара целых (x, y) либо None для
+            нейтрального элемента.
+        """
+        x, y, z = jpoint
+        if z == 0:
+            return None
+        red = self.field.reduce
+        z_inv = self.field.inv(z)
+        z_inv_sq = red(z_inv * z_inv)
+        return red(x * z_inv_sq), red(y * z_inv_sq * z_inv)
+
+    def from_jacobian(self, jpoint):
+        """ Якобиевы координаты -> аффинная точка Point. """
+        affine = self.jacobian_to_affine(jpoint)
+        if affine is None:
+            return self.neutral()
+        return self.point(*affine)
+
+    def jacobian_to_affine_batch(self, jpoints) -> list:
+        """ Пакетный вариант jacobian_to_affine с одним обращением на все
+            точки.
+        """
+        red = self.field.reduce
+        jpoints = list(jpoints)
+        z_invs = iter(self.field.batch_inv([z for _, _, z in jpoints if z]))
+        result = []
+        for x, y, z in jpoints:
+            if z == 0:
+                result.append(None)
+                continue
+            z_inv = next(z_invs)
+            z_inv_sq = red(z_inv * z_inv)
+            result.append((red(x * z_inv_sq), red(y * z_inv_sq * z_inv)))
+        return result
+
+    def normalize_batch(self, jpoints) -> list:
+        """ Якобиевы координаты -> аффинные точки Point для всего списка
+            с одним обращением.
+        """
+        return [
+            self.neutral() if affine is None else self.point(*affine)
+            for affine in self.jacobian_to_affine_batch(jpoints)
+        ]
+
+    def jacobian_neg(self, jpoint):
+        """ Возвращает -jpoint. """
+        x, y, z = jpoint
+        return x, self.field.neg(y), z
+
+    def jacobian_double(self, jpoint):
+        """ Удвоение точки (dbl-1998-cmo-2). Для a = -3 и a = 0 используются
+            сокращённые формулы вычисления M.
+        """
+        x1, y1, z1 = jpoint
+        if z1 == 0 or y1 == 0:
+            return self.JACOBIAN_NEUTRAL
+        red = self.field.reduce
+        xx = red(x1 * x1)
+        yy = red(y1 * y1)
+        yyyy = red(yy * yy)
+        s = red(4 * x1 * yy)
+        if self._a_is_minus_3:
+            zz = red(z1 * z1)
+            m = red(3 * (x1 - zz) * (x1 + zz))
+        elif self._a_is_zero:
+            m = red(3 * xx)
+        else:
+            zz = red(z1 * z1)
+            m = red(3 * xx + self._a_int * red(zz * zz))
+        x3 = red(m * m - 2 * s)
+        y3 = red(m * (s - x3) - 8 * yyyy)
+        z3 = red(2 * y1 * z1)
+        return x3, y3, z3
+
+    def jacobian_add(self, jpoint1, jpoint2):
+        """ Сложение двух точек в якобиевых координатах (add-2007-bl). """
+        x1, y1, z1 = jpoint1
+        x2, y2, z2 = jpoint2
+        if z1 == 0:
+            return jpoint2
+        if z2 == 0:
+            return jpoint1
+        red = self.field.reduce
+        p = self.field.p
+        z1z1 = red(z1 * z1)
+        z2z2 = red(z2 * z2)
+        u1 = red(x1 * z2z2)
+        u2 = red(x2 * z1z1)
+        s1 = red(y1 * red(z2 * z2z2))
+        s2 = red(y2 * red(z1 * z1z1))
+        h = (u2 - u1) % p
+        r = (s2 - s1) % p
+        if h == 0:
+            if r == 0:
+                return self.jacobian_double(jpoint1)
+            return self.JACOBIAN_NEUTRAL
+        hh = red(h * h)
+        hhh = red(h * hh)
+        v = red(u1 * hh)
+        x3 = red(r * r - hhh - 2 * v)
+        y3 = red(r * (v - x3) - s1 * hhh)
+        z3 = red(red(z1 * z2) * h)
+        return x3, y3, z3
+
+    def jacobian_add_mixed(self, jpoint, x2: int, y2: int):
+        """ Сложение точки в якобиевых координатах с аффинной точкой
+            (x2, y2), то есть с Z2 = 1 (madd-2007-bl).
+        """
+        x1, y1, z1 = jpoint
+        if z1 == 0:
+            return x2, y2, 1
+        red = self.field.reduce
+        p = self.field.p
+        z1z1 = red(z1 * z1)
+        u2 = red(x2 * z1z1)
+        s2 = red(y2 * red(z1 * z1z1))
+        h = (u2 - x1) % p
+        r = (s2 - y1) % p
+        if h == 0:
+            if r == 0:
+                return self.jacobian_double(jpoint)
+            return self.JACOBIAN_NEUTRAL
+        hh = red(h * h)
+        hhh = red(h * hh)
+        v = red(x1 * hh)
+        x3 = red(r * r - hhh - 2 * v)
+        y3 = red(r * (v - x3) - y1 * hhh)
+        z3 = red(z1 * h)
+        return x3, y3, z3
+
+    def jacobian_multiply(self, point, scalar: int):
+        """ Умножение аффинной точки на скаляр, результат — в якобиевых
+            координатах. Для генератора кривой используется таблица
+            предвычислений (см. gen_table).
+        """
+        if self._uses_gen_table(point):
+            return self.jacobian_fixed_base_multiply(scalar)
+        if self._glv is not None:
+            return self.jacobian_straus(self._glv_terms(scalar, point))
+        return self.jacobian_wnaf_multiply(point, scalar)
+
+    def jacobian_double_and_add(self, point, scalar: int):
+        """ Умножение аффинной точки на скаляр методом "удвоение-сложение"
+            слева направо. Результат — в якобиевых координатах.
+        """
+        if scalar == 0 or point.is_neutral:
+            return self.JACOBIAN_NEUTRAL
+        x, y = int(point.x), int(point.y)
+        result = (x, y, 1)
+        for bit in bin(scalar)[3:]:
+            result = self.jacobian_double(result)
+            if bit == '1':
+                result = self.jacobian_add_mixed(result, x, y)
+        return result
+
+    def odd_multiples(self, point, width: int) -> list:
+        """ Нечётные кратные P, 3P, ..., (2^(width - 1) - 1)P аффинной
+            точки в виде пар целых (x, y), приведённые к аффинным
+            координатам одним обращением (None вместо нейтрального элемента).
+        """
+        return self.odd_multiples_batch([point], width)[0]
+
+    def odd_multiples_batch(self, points, width: int) -> list:
+        """ Таблицы odd_multiples для нескольких точек с одним обращением
+            на все таблицы.
+        """
+        count = 1 << (width - 2) if width > 2 else 1
+        multiples = []
+        for point in points:
+            jpoint = self.to_jacobian(point)
+            multiples.append(jpoint)
+            if width > 2:
+                double = self.jacobian_double(jpoint)
+                for _ in range(count - 1):
+                    multiples.append(self.jacobian_add(multiples[-1], double))
+        affine = self.jacobian_to_affine_batch(multiples)
+        return [affine[i:i + count] for i in range(0, len(affine), count)]
+
+    def _signed_odd_multiples(self, point, width: int):
+        """ Таблицы odd_multiples для точки и для -точки. """
+        neg = self.field.neg
+        positive = self.odd_multiples(point, width)
+        negative = [
+            None if m is None else (m[0], neg(m[1])) for m in positive
+        ]
+        return positive, negative
+
+    def jacobian_wnaf_multiply(self, point, scalar: int, width: int = None):
+        """ Умножение аффинной точки на скаляр по его width-NAF
+            представлению. По умолчанию ширина окна выбирается по размеру
+            кривой (см. wnaf_width). Результат — в якобиевых координатах.
+        """
+        if scalar == 0 or point.is_neutral:
+            return self.JACOBIAN_NEUTRAL
+        if width is None:
+            width = self.wnaf_width
+        positive, negative = self._signed_odd_multiples(point, width)
+        result = self.JACOBIAN_NEUTRAL
+        for digit in reversed(wnaf(scalar, width)):
+            result = self.jacobian_double(result)
+            if digit:
+                entry = positive[digit >> 1] if digit > 0 \
+                    else negative[-digit >> 1]
+                if entry is not None:
+                    result = self.jacobian_add_mixed(result, *entry)
+        return result
+
+    def jacobian_multi_scalar_multiply(self, terms):
+        """ Сумма k_1 * P_1 + ... + k_n * P_n для пар (k_i, P_i).
+            Слагаемое с генератором кривой вычисляется по таблице
+            предвычислений, если она используется; на кривых с эндоморфизмом
+            GLV остальные скаляры раскладываются на половинки. Затем всё
+            складывается методом Штрауса, а начиная с PIPPENGER_MIN_TERMS
+            слагаемых — методом Пиппенджера. Результат — в якобиевых
+            координатах.
+        """
+        result = self.JACOBIAN_NEUTRAL
+        straus_terms = []
+        for scalar, point in terms:
+            assert (scalar >= 0)
+            if scalar == 0 or point.is_neutral:
+                continue
+            if self._uses_gen_table(point):
+                result = self.jacobian_add(
+                    result, self.jacobian_fixed_base_multiply(scalar)
+                )
+            elif self._glv is not None:
+                straus_terms.extend(self._glv_terms(scalar, point))
+            else:
+                straus_terms.append((scalar, point))
+        if len(straus_terms) >= self.PIPPENGER_MIN_TERMS:
+            return self.jacobian_add(
+                result, self.jacobian_pippenger(straus_terms)
+            )
+        return self.jacobian_add(result, self.jacobian_straus(straus_terms))
+
+    def jacobian_straus(self, terms):
+        """ Сумма k_1 * P_1 + ... + k_n * P_n методом Штрауса: width-NAF
+            представления скаляров обрабатываются чередуясь, с общей
+            цепочкой удвоений. Результат — в якобиевых координатах.
+        """
+        interleaved = []
+        for scalar, point in terms:
+            if scalar == 0 or point.is_neutral:
+                continue
+            width = self.wnaf_width
+            positive, negative = self._signed_odd_multiples(point, width)
+            interleaved.append((wnaf(scalar, width), positive, negative))
+
+        return self._jacobian_interleave(interleaved)
+
+    def _jacobian_interleave(self, interleaved):
+        """ Общая цепочка удвоений для троек (digits, positive, negative):
+            width-NAF цифр и таблиц нечётных кратных точки и -точки.
+        """
+        chain = self.JACOBIAN_NEUTRAL
+        if interleaved:
+            length = max(len(digits) for digits, _, _ in interleaved)
+            for i in reversed(range(length)):
+                chain = self.jacobian_double(chain)
+                for digits, positive, negative in interleaved:
+                    if i >= len(digits):
+                        continue
+                    digit = digits[i]
+                    if digit:
+                        entry = positive[digit >> 1] if digit > 0 \
+                            else negative[-digit >> 1]
+                        if entry is not None:
+                            chain = self.jacobian_add_mixed(chain, *entry)
+        return chain
+
+    def recode_scalar(self, scalar: int):
+        """ Представление скаляра, не зависящее от точки, для многократного
+            умножения разных точек на него (см. jacobian_multiply_recoded):
+            пара (width, parts), где parts — тройки (digits, phi, negate):
+            width-NAF цифры, признак умножения на образ phi(P) и признак
+            смены знака. На кривых с GLV скаляр раскладывается на половинки.
+        """
+        width = self.wnaf_width
+        if self._glv is not None:
+            k1, k2 = self.glv_split(scalar % self.order)
+            return width, [
+                (wnaf(abs(k1), width), False, k1 < 0),
+                (wnaf(abs(k2), width), True, k2 < 0),
+            ]
+        return width, [(wnaf(scalar, width), False, False)]
+
+    def jacobian_multiply_recoded(self, recoding, multiples):
+        """ k * P по представлению recode_scalar(k) и таблице
+            odd_multiples(P, width) той же ширины. Таблица для phi(P)
+            получается из таблицы P умножением x на beta. Результат — в
+            якобиевых координатах.
+        """
+        width, parts = recoding
+        field = self.field
+        interleaved = []
+        for digits, use_phi, negate in parts:
+            if not digits:
+                continue
+            positive = multiples
+            if use_phi:
+                beta = self._glv.beta
+                positive = [
+                    None if m is None else (field.mul(beta, m[0]), m[1])
+                    for m in positive
+                ]
+            negative = [
+                None if m is None else (m[0], field.neg(m[1]))
+                for m in positive
+            ]
+            if negate:
+                positive, negative = negative, positive
+            interleaved.append((digits, positive, negative))
+        return self._jacobian_interleave(interleaved)
+
+    def jacobian_pippenger(self, terms, width: int = None):
+        """ Сумма k_1 * P_1 + ... + k_n * P_n методом корзин Пиппенджера.
+            Скаляры раскладываются по основанию 2^width со знаковыми
+            цифрами; в каждом окне точки раскладываются по корзинам по
+            абсолютной величине цифры, а корзины сворачиваются бегущей
+            суммой. По умолчанию ширина окна подбирается по числу
+            слагаемых. Результат — в якобиевых координатах.
+        """
+        neg = self.field.neg
+        scalars, points = [], []
+        for scalar, point in terms:
+            if scalar == 0 or point.is_neutral:
+                continue
+            scalars.append(scalar)
+            points.append((int(point.x), int(point.y)))
+        if not points:
+            return self.JACOBIAN_NEUTRAL
+        if width is None:
+            width = optimal_pippenger_window(
+                len(points), max(scalars).bit_length()
+            )
+        digits = [signed_window_digits(scalar, width) for scalar in scalars]
+        windows = max(len(d) for d in digits)
+        buckets_count = 1 << (width - 1)
+
+        result = self.JACOBIAN_NEUTRAL
+        for i in reversed(range(windows)):
+            for _ in range(width):
+                result = self.jacobian_double(result)
+            buckets = [self.JACOBIAN_NEUTRAL] * (buckets_count + 1)
+            for point_digits, (x, y) in zip(digits, points):
+                if i >= len(point_digits):
+                    continue
+                digit = point_digits[i]
+                if digit > 0:
+                    buckets[digit] = self.jacobian_add_mixed(
+                        buckets[digit], x, y
+                    )
+                elif digit < 0:
+                    buckets[-digit] = self.jacobian_add_mixed(
+                        buckets[-digit], x, neg(y)
+                    )
+            # сумма d * buckets[d] бегущими суммами
+            running = window_sum = self.JACOBIAN_NEUTRAL
+            for bucket in reversed(buckets[1:]):
+                running = self.jacobian_add(running, bucket)
+                window_sum = self.jacobian_add(window_sum, running)
+            result = self.jacobian_add(result, window_sum)
+        return result
+
+    def multi_scalar_mul(self, terms):
+        """ Сумма k_1 * P_1 + ... + k_n * P_n для пар (k_i, P_i). """
+        return self.from_jacobian(self.jacobian_multi_scalar_multiply(terms))
+
+    def _uses_gen_table(self, point):
+        return (self.gen_table_width > 0) and self.has_generator and \
+            (self.order is not None) and \
+            ((point is self.gen) or (point == self.gen))
+
+    def _build_gen_table(self, width: int):
+        """ Таблица фиксированного окна для генератора кривой. """
+        return self.build_fixed_base_table(self.gen, width)
+
+    def build_fixed_base_table(self, point, width: int):
+        """ Таблица с фиксированным окном ширины width: строка i содержит
+            аффинные точки j * 2^(width * i) * P для j = 1 .. 2^width - 1
+            (None вместо нейтрального элемента). Число строк определяется
+            порядком кривой, поэтому точка должна лежать в подгруппе.
+        """
+        row_length = (1 << width) - 1
+        multiples = []
+        base = self.to_jacobian(point)
+        for _ in range((self.order.bit_length() + width - 1) // width):
+            multiple = base
+            for _ in range(row_length):
+                multiples.append(multiple)
+                multiple = self.jacobian_add(multiple, base)
+            base = multiple
+        affine = self.jacobian_to_affine_batch(multiples)
+        rows = [
+            affine[i:i + row_length]
+            for i in range(0, len(affine), row_length)
+        ]
+        return width, rows
+
+    def jacobian_fixed_base_multiply(self, scalar: int):
+        """ Умножение генератора на скаляр по таблице предвычислений. """
+        return self.jacobian_table_multiply(self.gen_table, scalar)
+
+    def jacobian_table_multiply(self, table, scalar: int):
+        """ Умножение точки на скаляр по её таблице build_fixed_base_table:
+            одно смешанное сложение на окно, без удвоений. Скаляр
+            приводится по модулю order, поэтому точка должна лежать в
+            подгруппе порядка order.
+        """
+        width, rows = table
+        mask = (1 << width) - 1
+        scalar %= self.order
+        result = self.JACOBIAN_NEUTRAL
+        for row in rows:
+            digit = scalar & mask
+            if digit:
+                entry = row[digit - 1]
+                if entry is not None:
+                    result = self.jacobian_add_mixed(result, *entry)
+            scalar >>= width
+        return result
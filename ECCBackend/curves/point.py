@@ -1,9 +1,8 @@
 from ECCBackend.curves.field_element import FieldElement
-from ECCBackend.curves.point_operations import NaiveOrderCalculation,\
-    ScalarMultiplicationXOnly
+from ECCBackend.curves.point_operations import NaiveOrderCalculation
 
 
-class Point(NaiveOrderCalculation, ScalarMultiplicationXOnly):
+class Point(NaiveOrderCalculation):
     def __init__(self, x: int | None, y: int | None, curve):
         assert (((x is None) and (y is None)) or
                 ((x is not None) and (y is not None)))
@@ -54,15 +53,7 @@ class Point(NaiveOrderCalculation, ScalarMultiplicationXOnly):
     def __mul__(self, scalar: int):
         """ Умножение точки на скаляр. """
         assert (scalar >= 0)
-
-        result = self.curve.neutral()
-        n = self
-        if scalar > 0:
-            for bit in range(scalar.bit_length()):
-                if scalar & (1 << bit):
-                    result += n
-                n += n
-        return result
+        return self.curve.point_multiplication(self, scalar)
 
     def __eq__(self, other):
         return (self.x, self.y) == (other.x, other.y)
@@ -73,10 +64,29 @@ class Point(NaiveOrderCalculation, ScalarMultiplicationXOnly):
     def __hash__(self):
         return hash((self.x, self.y))
 
+    def encode(self, compressed: bool = True) -> bytes:
+        """ Кодировка точки по SEC1: 0x02 / 0x03 (чётность y) и x для
+            сжатой формы, 0x04, x и y для несжатой, 0x00 для нейтрального
+            элемента. Координаты — big-endian длиной в байтах модуля.
+        """
+        if self.is_neutral:
+            return b'\x00'
+        length = self.curve.coordinate_length
+        x = int(self.x).to_bytes(length, byteorder='big')
+        if compressed:
+            return bytes((2 | (int(self.y) & 1),)) + x
+        return b'\x04' + x + int(self.y).to_bytes(length, byteorder='big')
+
     def on_curve(self):
         """ True, если точка лежит на кривой, иначе False. """
         return self.curve.on_curve(self)
 
+    def order(self) -> int:
+        """ Порядок точки по разложению #E(F_p) (см.
+            EllipticCurve.point_order).
+        """
+        return self.curve.point_order(self)
+
     def __repr__(self):
         return str(self)
 
@@ -0,0 +1,192 @@
+import math
+
+from ECCBackend.secure_random import rand_int
+
+# Модули меньше этого значения считаются перебором (count_points): теорема
+# Местре гарантирует завершение BSGS только при p > 229
+BSGS_MIN_MODULUS = 1 << 10
+
+# Наибольшее число шагов младенца: таблица абсцисс ограничивает память,
+# остальное добирается гигантскими шагами
+BSGS_MAX_BABY_STEPS = 1 << 21
+
+# Сколько шагов переводится в аффинные координаты одним обращением
+BSGS_BATCH = 512
+
+# Сколько пар случайных точек (на кривой и на кручении) пробуется, прежде
+# чем признать, что порядок не определяется однозначно
+MESTRE_MAX_ROUNDS = 64
+
+
+def hasse_interval(modulus: int):
+    """ Границы [p + 1 - 2 sqrt(p), p + 1 + 2 sqrt(p)] теоремы Хассе. """
+    width = math.isqrt(4 * modulus)
+    return modulus + 1 - width, modulus + 1 + width
+
+
+def _multiply(curve, affine, scalar: int):
+    """ scalar * (x, y) для пары целых либо None; scalar любого знака. """
+    if affine is None:
+        return None
+    if scalar < 0:
+        affine = (affine[0], curve.field.neg(affine[1]))
+        scalar = -scalar
+    return curve.jacobian_to_affine(
+        curve.jacobian_wnaf_multiply(curve.point(*affine), scalar)
+    )
+
+
+def _random_point(curve):
+    """ Случайная аффинная точка кривой парой целых (x, y). """
+    p = curve.modulus
+    while True:
+        points = curve.get_point_with_x(rand_int(p))
+        if points is not None:
+            point = points[rand_int(2)]
+            return int(point.x), int(point.y)
+
+
+def _small_order_solution(curve, base, target, table, order: int):
+    """ k из [0, order) с k * base = target по таблице абсцисс j * base
+        для j < order / 2 + 1.
+    """
+    if target is None:
+        return 0
+    j = table.get(target[0])
+    if j is None:
+        raise Exception('The point is not a multiple of the base point')
+    if _multiply(curve, base, j) == target:
+        return j
+    return order - j
+
+
+def _bsgs(curve, base, target, count: int):
+    """ Наименьшее k из [0, count) с k * base = target (шаги младенца —
+        гиганта) и порядок base, если он найден попутно: по совпадению
+        абсцисс шагов младенца либо как разность двух первых решений.
+        Абсциссы x(j * base) покрывают и -j, поэтому гигантский шаг равен
+        2m + 1 при m шагах младенца. Возвращает пару (k, order), order —
+        None, если второе решение не попадает в [0, count).
+    """
+    if base is None:
+        if target is not None:
+            raise Exception('The point is not a multiple of the base point')
+        return 0, 1
+    m = min(math.isqrt(count // 2) + 1, BSGS_MAX_BABY_STEPS)
+    table = {}
+    jpoint = curve.JACOBIAN_NEUTRAL
+    j = 0
+    while j < m:
+        batch = []
+        for _ in range(min(BSGS_BATCH, m - j)):
+            jpoint = curve.jacobian_add_mixed(jpoint, *base)
+            batch.append(jpoint)
+        for affine in curve.jacobian_to_affine_batch(batch):
+            j += 1
+            if affine is None:
+                return _small_order_solution(curve, base, target, table, j), j
+            previous = table.get(affine[0])
+            if previous is not None:
+                # j * base = +-previous * base
+                if _multiply(curve, base, j - previous) is None:
+                    order = j - previous
+                else:
+                    order = j + previous
+                k = _small_order_solution(curve, base, target, table, order)
+                return k, order
+            table[affine[0]] = j
+
+    step = 2 * m + 1
+    giant = curve.jacobian_to_affine(
+        curve.jacobian_add_mixed(curve.jacobian_double(jpoint), *base)
+    )
+    if giant is None:
+        # порядок base делит 2m + 1 и больше 2m
+        return _small_order_solution(curve, base, target, table, step), step
+    giant = (giant[0], curve.field.neg(giant[1]))
+
+    solutions = []
+    jpoint = curve.JACOBIAN_NEUTRAL if target is None \
+        else (target[0], target[1], 1)
+    i = 0
+    while i * step - m < count:
+        batch = [jpoint]
+        for _ in range(BSGS_BATCH - 1):
+            jpoint = curve.jacobian_add_mixed(jpoint, *giant)
+            batch.append(jpoint)
+        jpoint = curve.jacobian_add_mixed(jpoint, *giant)
+        for affine in curve.jacobian_to_affine_batch(batch):
+            # target - i * step * base = (k - i * step) * base
+            if affine is None:
+                k = i * step
+            else:
+                j = table.get(affine[0])
+                if j is None:
+                    k = None
+                elif _multiply(curve, base, j) == affine:
+                    k = i * step + j
+                else:
+                    k = i * step - j
+            i += 1
+            if k is None or not (0 <= k < count):
+                continue
+            solutions.append(k)
+            if len(solutions) == 2:
+                return solutions[0], solutions[1] - solutions[0]
+    if not solutions:
+        raise Exception('The point is not a multiple of the base point')
+    return solutions[0], None
+
+
+def _interval_solutions(curve, point, residue: int, modulus: int,
+                        low: int, high: int):
+    """ Все N из [low, high], N = residue mod modulus, с N * point = O в
+        виде пары (first, step): first, first + step, ... Если такое N
+        одно, step — None.
+    """
+    n_low = -((residue - low) // modulus)
+    count = (high - residue) // modulus - n_low + 1
+    start = residue + modulus * n_low
+    if count == 1:
+        return start, None
+    # (start + modulus * k) * point = O <=> k * R = -start * point
+    k, order = _bsgs(
+        curve, _multiply(curve, point, modulus),
+        _multiply(curve, point, -start), count
+    )
+    if order is None or k + order >= count:
+        return start + modulus * k, None
+    return start + modulus * k, modulus * order
+
+
+def mestre_curve_order(curve, twist, modulus: int = 1,
+                       residue: int = 0) -> int:
+    """ #E(F_p) методом шагов младенца — гиганта Шэнкса — Местре. Для
+        случайных точек кривой и её квадратичного кручения twist
+        (#E + #E' = 2p + 2) ищутся кратные их порядков в интервале Хассе;
+        найденные порядки сужают сравнение #E = residue mod modulus, пока в
+        интервале не останется одно значение. Начальное сравнение задают
+        modulus и residue: например, порядок генератора как делитель #E или
+        t mod l из алгоритма Шуфа. Время — O(p^(1/4) / sqrt(modulus))
+        сложений точек.
+    """
+    p = curve.modulus
+    assert (p >= BSGS_MIN_MODULUS)
+    low, high = hasse_interval(p)
+    total = 2 * p + 2
+    for _ in range(MESTRE_MAX_ROUNDS):
+        first, step = _interval_solutions(
+            curve, _random_point(curve), residue, modulus, low, high
+        )
+        if step is None:
+            return first
+        residue, modulus = first % step, step
+
+        first, step = _interval_solutions(
+            twist, _random_point(twist), (total - residue) % modulus,
+            modulus, low, high
+        )
+        if step is None:
+            return total - first
+        residue, modulus = (total - first) % step, step
+    raise Exception('#E(F_p) is not determined by the Hasse interval')
@@ -9,24 +9,100 @@ class NaiveOrderCalculation:
 
 
 class ScalarMultiplicationXOnly:
-    def _x_double(self, x):
-        if x is None:
+    """ Лестница Монтгомери по x-координате для кривых Вейерштрасса в
+        проективных координатах (X : Z), x = X / Z, без обращений на каждом
+        шаге (формулы Брие — Жуа). Нейтральный элемент — пара с Z = 0.
+    """
+    def _x_double(self, xz):
+        """ x(2P) по x(P). """
+        x, z = xz
+        red = self.field.reduce
+        a, b = self._a_int, self._b_int
+        xx = red(x * x)
+        zz = red(z * z)
+        xz = red(x * z)
+        t = xx - a * zz
+        new_x = red(t * t - 8 * b * red(xz * zz))
+        new_z = red(4 * z * red(x * xx + a * red(x * zz) + b * red(z * zz)))
+        return new_x, new_z
+
+    def _x_add(self, xz1, xz2, x_diff: int):
+        """ x(P + Q) по x(P), x(Q) и аффинной x(P - Q) = x_diff. """
+        x1, z1 = xz1
+        x2, z2 = xz2
+        red = self.field.reduce
+        z1z2 = red(z1 * z2)
+        x1z2 = red(x1 * z2)
+        x2z1 = red(x2 * z1)
+        t = red(x1 * x2 - self._a_int * z1z2)
+        new_x = red(t * t - 4 * self._b_int * red(z1z2 * (x1z2 + x2z1)))
+        u = x1z2 - x2z1
+        new_z = red(x_diff * red(u * u))
+        return new_x, new_z
+
+    def _x_ladder(self, x: int, scalar: int):
+        """ Возвращает пару (x(kP), x((k + 1)P)) в координатах (X : Z). """
+        assert (scalar > 0)
+        r0 = (x, 1)
+        r1 = self._x_double(r0)
+        for bit in bin(scalar)[3:]:
+            if bit == '1':
+                r0 = self._x_add(r0, r1, x)
+                r1 = self._x_double(r1)
+            else:
+                r1 = self._x_add(r0, r1, x)
+                r0 = self._x_double(r0)
+        return r0, r1
+
+    def _x_check(self, x: int):
+        """ Отвергает x, которому не соответствует точка кривой: иначе
+            лестница незаметно считала бы на кручении кривой.
+        """
+        rhs = self.field.reduce(x * x * x + self._a_int * x + self._b_int)
+        if rhs != 0 and not self.field.is_qr(rhs):
+            raise ValueError('No point with x = 0x%x on %s.' % (x, self))
+
+    def x_only_multiply(self, x: int, scalar: int):
+        """ Возвращает x-координату точки k * P по x-координате P либо
+            None, если результат — нейтральный элемент.
+        """
+        x %= self.field.p
+        self._x_check(x)
+        if scalar == 0:
             return None
-        den = 4 * (x ** 3 + self.curve.a * x + self.curve.b)
-        if den == 0:
-            # бесконечность
+        if x == 0:
+            # формула сложения вырождается при x(P - Q) = 0
+            point = self.point(0, self.field.sqrt(self._b_int))
+            result = self.jacobian_to_affine(
+                self.jacobian_multiply(point, scalar)
+            )
+            return None if result is None else result[0]
+        (x0, z0), _ = self._x_ladder(x, scalar)
+        if z0 == 0:
             return None
-        num = (x ** 2 - self.curve.a) ** 2 - (8 * self.curve.b * x)
-        return num // den
+        return self.field.mul(x0, self.field.inv(z0))
 
-    def _x_add(self, x1, x2, x3prime):
-        if x1 is None:
-            return x2
-        if x2 is None:
-            return x1
-        if x1 == x2:
-            return None
-        num = -4 * self.curve.b * (x1 + x2) + (x1 * x2 - self.curve.a) ** 2
-        den = x3prime * (x1 - x2) ** 2
-        result = num // den
-        return result
+    def x_only_multiply_point(self, point, scalar: int):
+        """ Умножение точки на скаляр лестницей Монтгомери с
+            восстановлением y в конце (формула Окейи — Сакураи).
+        """
+        if scalar == 0 or point.is_neutral:
+            return self.neutral()
+        red = self.field.reduce
+        x, y = int(point.x), int(point.y)
+        if x == 0 or y == 0:
+            return self.from_jacobian(self.jacobian_multiply(point, scalar))
+        (x0, z0), (x1, z1) = self._x_ladder(x, scalar)
+        if z0 == 0:
+            return self.neutral()
+        if z1 == 0:
+            # (k + 1)P = O, то есть kP = -P
+            return -point
+        # одно обращение на x(kP), x((k + 1)P) и деление на 2y
+        inv = self.field.inv(red(2 * y * red(z0 * z1)))
+        q_x = red(red(x0 * z1) * red(2 * y * inv))
+        next_x = red(red(x1 * z0) * red(2 * y * inv))
+        num = red(2 * self._b_int + red(self._a_int + x * q_x) * (x + q_x) -
+                  next_x * red((x - q_x) ** 2))
+        q_y = red(num * red(red(z0 * z1) * inv))
+        return self.point(q_x, q_y)
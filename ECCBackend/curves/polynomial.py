@@ -0,0 +1,253 @@
+import math
+
+# Многочлены над F_p — списки коэффициентов от младшего к старшему без
+# нулевых старших коэффициентов; нулевой многочлен — пустой список.
+
+# С какой длины многочлены перемножаются подстановкой Кронекера: упакованные
+# в одно целое коэффициенты перемножает длинная арифметика CPython
+# (Карацуба), а не цикл на Python
+KRONECKER_MIN_LENGTH = 16
+
+
+def poly_trim(a: list) -> list:
+    """ Отбрасывает нулевые старшие коэффициенты (на месте). """
+    while a and not a[-1]:
+        a.pop()
+    return a
+
+
+def poly_add(a: list, b: list, p: int) -> list:
+    if len(a) < len(b):
+        a, b = b, a
+    result = [(x + y) % p for x, y in zip(a, b)]
+    result.extend(a[len(b):])
+    return poly_trim(result)
+
+
+def poly_sub(a: list, b: list, p: int) -> list:
+    result = [(x - y) % p for x, y in zip(a, b)]
+    if len(a) > len(b):
+        result.extend(a[len(b):])
+    else:
+        result.extend((-y) % p for y in b[len(a):])
+    return poly_trim(result)
+
+
+def poly_neg(a: list, p: int) -> list:
+    return [(-x) % p for x in a]
+
+
+def poly_scale(a: list, c: int, p: int) -> list:
+    c %= p
+    if not c:
+        return []
+    return [x * c % p for x in a]
+
+
+def poly_monic(a: list, p: int) -> list:
+    """ Многочлен со старшим коэффициентом 1. """
+    if not a or a[-1] == 1:
+        return a
+    return poly_scale(a, pow(a[-1], -1, p), p)
+
+
+def _kronecker_width(p: int, length: int) -> int:
+    """ Ширина ячейки в байтах, в которую помещается сумма length
+        произведений коэффициентов.
+    """
+    return (2 * (p - 1).bit_length() + length.bit_length() + 7) // 8
+
+
+def _pack(a: list, width: int) -> int:
+    return int.from_bytes(
+        b''.join(c.to_bytes(width, byteorder='little') for c in a),
+        byteorder='little'
+    )
+
+
+def _unpack(value: int, width: int, count: int, p: int) -> list:
+    data = value.to_bytes(width * count, byteorder='little')
+    return poly_trim([
+        int.from_bytes(data[i:i + width], byteorder='little') % p
+        for i in range(0, width * count, width)
+    ])
+
+
+def poly_mul(a: list, b: list, p: int) -> list:
+    """ Произведение многочленов: в столбик для коротких, иначе
+        подстановкой Кронекера.
+    """
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) < KRONECKER_MIN_LENGTH:
+        if len(a) < len(b):
+            a, b = b, a
+        n = len(a)
+        result = [0] * (n + len(b) - 1)
+        for i, c in enumerate(b):
+            if c:
+                result[i:i + n] = [
+                    r + c * d for r, d in zip(result[i:i + n], a)
+                ]
+        return poly_trim([c % p for c in result])
+    width = _kronecker_width(p, min(len(a), len(b)))
+    return _unpack(
+        _pack(a, width) * _pack(b, width), width, len(a) + len(b) - 1, p
+    )
+
+
+def poly_sqr(a: list, p: int) -> list:
+    if len(a) < KRONECKER_MIN_LENGTH:
+        return poly_mul(a, a, p)
+    width = _kronecker_width(p, len(a))
+    packed = _pack(a, width)
+    return _unpack(packed * packed, width, 2 * len(a) - 1, p)
+
+
+def poly_divmod(a: list, b: list, p: int):
+    """ Частное и остаток от деления a на b в столбик. """
+    assert (b)
+    nb = len(b)
+    if len(a) < nb:
+        return [], a[:]
+    inv = pow(b[-1], -1, p)
+    low = b[:-1]
+    r = a[:]
+    q = [0] * (len(a) - nb + 1)
+    for i in range(len(a) - nb, -1, -1):
+        c = r[i + nb - 1] * inv % p
+        q[i] = c
+        if c:
+            r[i:i + nb - 1] = [
+                (x - c * y) % p for x, y in zip(r[i:i + nb - 1], low)
+            ]
+    return q, poly_trim(r[:nb - 1])
+
+
+def poly_gcdex(a: list, b: list, p: int):
+    """ Пара (g, s): g — нормированный НОД a и b, s * a = g mod b. """
+    r0, r1 = b, a
+    s0, s1 = [], [1]
+    while r1:
+        q, r = poly_divmod(r0, r1, p)
+        r0, r1 = r1, r
+        s0, s1 = s1, poly_sub(s0, poly_mul(q, s1, p), p)
+    if not r0:
+        return [], []
+    inv = pow(r0[-1], -1, p)
+    return poly_scale(r0, inv, p), poly_scale(s0, inv, p)
+
+
+def poly_gcd(a: list, b: list, p: int) -> list:
+    """ Нормированный НОД многочленов. """
+    while b:
+        a, b = b, poly_divmod(a, b, p)[1]
+    return poly_monic(a, p)
+
+
+def _series_inverse(a: list, precision: int, p: int) -> list:
+    """ 1 / a mod x^precision итерацией Ньютона; a[0] обратим. """
+    g = [pow(a[0], -1, p)]
+    k = 1
+    while k < precision:
+        k = min(2 * k, precision)
+        # g <- g * (2 - a * g) mod x^k
+        e = poly_trim(poly_neg(poly_mul(a[:k], g, p)[:k], p))
+        e[0] = (e[0] + 2) % p
+        g = poly_trim(poly_mul(g, e, p)[:k])
+    return g
+
+
+class PolynomialModulus:
+    """ Кольцо вычетов F_p[x] / (h). Остаток от деления на h находится
+        двумя умножениями по заранее вычисленному обратному ряду для
+        перевёрнутого h (вариант редукции Барретта), а не делением в
+        столбик; умножения — подстановкой Кронекера (см. poly_mul).
+    """
+    __slots__ = ('_p', '_modulus', '_degree', '_inverse')
+
+    def __init__(self, modulus: list, p: int):
+        modulus = poly_monic(poly_trim(list(modulus)), p)
+        assert (len(modulus) >= 2)
+        self._p = p
+        self._modulus = modulus
+        self._degree = len(modulus) - 1
+        self._inverse = _series_inverse(modulus[::-1], self._degree, p)
+
+    @property
+    def p(self):
+        return self._p
+
+    @property
+    def modulus(self):
+        """ Нормированный многочлен h. """
+        return self._modulus
+
+    @property
+    def degree(self):
+        return self._degree
+
+    def reduce(self, a: list) -> list:
+        """ Остаток от деления a на h. """
+        n = self._degree
+        if len(a) <= n:
+            return a
+        if len(a) > 2 * n:
+            return poly_divmod(a, self._modulus, self._p)[1]
+        p = self._p
+        m = len(a) - n
+        # перевёрнутое частное: старшие m коэффициентов a на 1 / rev(h)
+        q = poly_mul(a[:n - 1:-1], self._inverse[:m], p)[:m]
+        q = q + [0] * (m - len(q))
+        product = poly_mul(q[::-1], self._modulus, p)[:n]
+        return poly_sub(a[:n], product, p)
+
+    def add(self, a: list, b: list) -> list:
+        return poly_add(a, b, self._p)
+
+    def sub(self, a: list, b: list) -> list:
+        return poly_sub(a, b, self._p)
+
+    def mul(self, a: list, b: list) -> list:
+        return self.reduce(poly_mul(a, b, self._p))
+
+    def sqr(self, a: list) -> list:
+        return self.reduce(poly_sqr(a, self._p))
+
+    def pow(self, a: list, exponent: int) -> list:
+        """ a^exponent mod h слева направо. """
+        assert (exponent >= 0)
+        result = [1]
+        for bit in bin(exponent)[2:]:
+            result = self.sqr(result)
+            if bit == '1':
+                result = self.mul(result, a)
+        return result
+
+    def compose(self, g: list, a: list) -> list:
+        """ g(a) mod h модульной композицией Брента — Кунга: степени
+            a^0, ..., a^k, k ~ sqrt(deg g), вычисляются один раз, блоки
+            g по k коэффициентов собираются линейными комбинациями
+            упакованных степеней, а сами блоки — схемой Горнера по a^k.
+        """
+        p = self._p
+        # g не приводится по модулю h: g(a) != (g mod h)(a) при a != x
+        if len(g) <= 1:
+            return g
+        k = math.isqrt(len(g) - 1) + 1
+        powers = [[1]]
+        for _ in range(k):
+            powers.append(self.mul(powers[-1], a))
+        width = _kronecker_width(p, k)
+        count = self._degree
+        packed = [_pack(power, width) for power in powers[:k]]
+        result = []
+        for start in reversed(range(0, len(g), k)):
+            block = sum(
+                c * power for c, power in zip(g[start:start + k], packed)
+            )
+            result = poly_add(
+                self.mul(result, powers[k]),
+                _unpack(block, width, count, p), p
+            )
+        return result
@@ -0,0 +1,257 @@
+from ECCBackend.curves.reduction import reduction_for
+from ECCBackend.primes import jacobi_symbol
+
+# Разрядность модуля, начиная с которой символ Лежандра вычисляется
+# двоичным алгоритмом Якоби, а не критерием Эйлера
+JACOBI_MIN_BITS = 30
+
+# legendre_batch строит таблицу квадратов, если значений не меньше p / 8
+QR_TABLE_RATIO = 8
+
+# 2-адичность p - 1, начиная с которой корень извлекается по таблице
+# дискретных логарифмов, а не циклом Тонелли — Шэнкса
+SQRT_TABLE_MIN_TWO_ADICITY = 32
+
+# Ширина окна таблицы дискретных логарифмов для квадратного корня
+SQRT_TABLE_WINDOW = 8
+
+
+class PrimeField:
+    """ Поле вычетов по простому модулю p. Элементы — обычные целые числа
+        из диапазона [0, p), так что арифметика не создаёт объектов.
+        Используется движком точек кривой; FieldElement — публичная обёртка
+        над ним. Экземпляры кэшируются по модулю (см. PrimeField.get).
+    """
+    __slots__ = ('p', 'reduction', 'reduce', '_sqrt_constants',
+                 '_sqrt_table_cache')
+
+    _fields = {}
+
+    def __init__(self, modulus: int, reduction=None):
+        self.p = modulus
+        # стратегия приведения: сдвиговая для модулей специального вида,
+        # иначе встроенное деление (см. ECCBackend.curves.reduction)
+        self.reduction = reduction or reduction_for(modulus)
+        self.reduce = self.reduction.reduce
+        self._sqrt_constants = None
+        self._sqrt_table_cache = None
+
+    @classmethod
+    def get(cls, modulus: int):
+        """ Поле с данным модулем, общее для всех кривых и элементов. """
+        field = cls._fields.get(modulus)
+        if field is None:
+            field = cls._fields.setdefault(modulus, cls(modulus))
+        return field
+
+    def add(self, a: int, b: int) -> int:
+        s = a + b
+        return s - self.p if s >= self.p else s
+
+    def sub(self, a: int, b: int) -> int:
+        d = a - b
+        return d + self.p if d < 0 else d
+
+    def neg(self, a: int) -> int:
+        return self.p - a if a else 0
+
+    def mul(self, a: int, b: int) -> int:
+        return self.reduce(a * b)
+
+    def sqr(self, a: int) -> int:
+        return self.reduce(a * a)
+
+    def pow(self, a: int, exponent: int) -> int:
+        return pow(a, exponent, self.p)
+
+    def inv(self, a: int) -> int:
+        if a % self.p == 0:
+            raise ZeroDivisionError('Impossible inverse.')
+        return pow(a, -1, self.p)
+
+    def batch_inv(self, values) -> list:
+        """ Обращает все ненулевые элементы values трюком Монтгомери:
+            3(n - 1) умножений и одно обращение.
+        """
+        red = self.reduce
+        values = list(values)
+        prefix = []
+        acc = 1
+        for value in values:
+            if value % self.p == 0:
+                raise ZeroDivisionError('Impossible inverse.')
+            prefix.append(acc)
+            acc = red(acc * value)
+        if not prefix:
+            return []
+        acc_inv = pow(acc, -1, self.p)
+        inverses = [0] * len(prefix)
+        for i in reversed(range(len(prefix))):
+            inverses[i] = red(prefix[i] * acc_inv)
+            acc_inv = red(acc_inv * values[i])
+        return inverses
+
+    def is_qr(self, a: int) -> bool:
+        """ True, если a — ненулевой квадратичный вычет. """
+        return self.legendre(a) == 1
+
+    def legendre(self, a: int) -> int:
+        """ Символ Лежандра (a / p): 0, 1 или -1. Для модулей от
+            JACOBI_MIN_BITS бит — двоичный алгоритм для символа Якоби,
+            для меньших — критерий Эйлера (pow для малых чисел быстрее).
+        """
+        p = self.p
+        if p.bit_length() >= JACOBI_MIN_BITS:
+            return jacobi_symbol(a, p)
+        a %= p
+        if a == 0:
+            return 0
+        return 1 if pow(a, (p - 1) // 2, p) == 1 else -1
+
+    def legendre_batch(self, values) -> list:
+        """ Символы Лежандра для последовательности values. Если значений
+            не меньше p / QR_TABLE_RATIO, вычеты берутся из таблицы
+            квадратов поля (p / 2 умножений на все значения), иначе символ
+            вычисляется для каждого значения.
+        """
+        values = list(values)
+        p = self.p
+        if len(values) * QR_TABLE_RATIO < p:
+            return [self.legendre(value) for value in values]
+        squares = bytearray(p)
+        for x in range(1, (p + 1) // 2):
+            squares[x * x % p] = 1
+        return [
+            0 if value % p == 0 else (1 if squares[value % p] else -1)
+            for value in values
+        ]
+
+    def _tonelli_shanks_constants(self):
+        """ p - 1 = q 2^s с нечётным q и c = z^q для наименьшего невычета
+            z; вычисляются один раз на поле.
+        """
+        if self._sqrt_constants is None:
+            p = self.p
+            q = p - 1
+            s = 0
+            while (q % 2) == 0:
+                s += 1
+                q >>= 1
+            z = 2
+            while self.is_qr(z):
+                z += 1
+            self._sqrt_constants = (q, s, pow(z, q, p))
+        return self._sqrt_constants
+
+    def _tonelli_shanks_sqrt(self, a: int):
+        """ Алгоритм Тонелли — Шэнкса; None, если a — невычет. """
+        p = self.p
+        q, s, c = self._tonelli_shanks_constants()
+
+        r = pow(a, (q + 1) // 2, p)
+        t = pow(a, q, p)
+        m = s
+        while t != 1:
+            # наименьшее i с t^(2^i) = 1 последовательным возведением
+            # в квадрат
+            i, t2 = 0, t
+            while t2 != 1:
+                t2 = t2 * t2 % p
+                i += 1
+                if i == m:
+                    return None
+
+            b = pow(c, 1 << (m - i - 1), p)
+            r = r * b % p
+            c = b * b % p
+            t = t * c % p
+            m = i
+
+        return r
+
+    def _sqrt_table(self):
+        """ Ширина окна w, таблица дискретных логарифмов h^j -> j для
+            h = c^(2^(s - w)) порядка 2^w и c^-1 для _table_sqrt;
+            вычисляются один раз на поле.
+        """
+        if self._sqrt_table_cache is None:
+            p = self.p
+            _, s, c = self._tonelli_shanks_constants()
+            width = min(SQRT_TABLE_WINDOW, s)
+            h = pow(c, 1 << (s - width), p)
+            lookup = {}
+            power = 1
+            for j in range(1 << width):
+                lookup[power] = j
+                power = power * h % p
+            self._sqrt_table_cache = (width, lookup, pow(c, -1, p))
+        return self._sqrt_table_cache
+
+    def _table_sqrt(self, a: int):
+        """ Корень по таблице (вариант Бернштейна): дискретный логарифм e
+            элемента t = a^q по основанию c в подгруппе порядка 2^s
+            находится окнами по w бит, тогда корень — a^((q + 1) / 2)
+            c^(-e / 2). Возведения в степень выполняются встроенным pow,
+            поэтому стоимость почти не зависит от s. None, если a —
+            невычет.
+        """
+        p = self.p
+        q, s, _ = self._tonelli_shanks_constants()
+        width, lookup, c_inv = self._sqrt_table()
+        x = pow(a, (q + 1) // 2, p)
+        u = pow(a, q, p)
+        e = 0
+        for k in range(0, s, width):
+            shift = s - k - width
+            v = pow(u, 1 << shift, p) if shift > 0 else u
+            j = lookup.get(v)
+            if j is None:
+                return None
+            if shift < 0:
+                # последнее неполное окно
+                j >>= -shift
+            if j:
+                e += j << k
+                u = u * pow(c_inv, j << k, p) % p
+        if e & 1:
+            return None
+        return x * pow(c_inv, e >> 1, p) % p
+
+    def _atkin_sqrt(self, a: int) -> int:
+        """ Формула Аткина для p = 5 mod 8: b = (2a)^((p - 5) / 8),
+            i = 2a b^2, корень — a b (i - 1). Для невычета результат не
+            является корнем.
+        """
+        p = self.p
+        two_a = 2 * a % p
+        b = pow(two_a, (p - 5) // 8, p)
+        i = two_a * b * b % p
+        return a * b * (i - 1) % p
+
+    def sqrt(self, a: int):
+        """ Квадратный корень из a либо None, если a — невычет. Какой из
+            двух корней возвращается, не определено. Для p = 3 mod 4 —
+            одно возведение в степень, для p = 5 mod 8 — формула Аткина,
+            иначе Тонелли — Шэнкс или, при 2-адичности p - 1 от
+            SQRT_TABLE_MIN_TWO_ADICITY, табличный вариант.
+        """
+        p = self.p
+        a %= p
+        if a == 0:
+            return 0
+        if (p % 4) == 3:
+            root = pow(a, (p + 1) // 4, p)
+        elif (p % 8) == 5:
+            root = self._atkin_sqrt(a)
+        elif self._tonelli_shanks_constants()[1] >= \
+                SQRT_TABLE_MIN_TWO_ADICITY:
+            root = self._table_sqrt(a)
+        else:
+            root = self._tonelli_shanks_sqrt(a)
+        # для невычета кандидат не является корнем
+        if root is None or root * root % p != a:
+            return None
+        return root
+
+    def __repr__(self):
+        return 'PrimeField<0x%x, %s>' % (self.p, self.reduction.name)
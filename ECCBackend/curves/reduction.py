@@ -0,0 +1,139 @@
+# Минимальная битовая длина модуля, начиная с которой сдвиговое приведение
+# на CPython обгоняет встроенное деление длинных чисел: на меньших модулях
+# вызов функции на Python обходится дороже самого деления.
+SPECIALIZED_REDUCTION_MIN_BITS = 256
+
+# Разрядность "цифры" длинного целого CPython: умножение на c, помещающееся
+# в одну цифру, выполняется отдельным быстрым путём.
+_DIGIT_BITS = 30
+
+
+class Reduction:
+    """ Стратегия приведения целого числа по модулю; по умолчанию —
+        встроенное x % p. Атрибут reduce — функция одного аргумента,
+        принимающая любое целое (в том числе отрицательное) и возвращающая
+        вычет из [0, p).
+    """
+    name = 'generic'
+
+    def __init__(self, modulus: int):
+        self.modulus = modulus
+        self.reduce = self._make_reduce()
+
+    @classmethod
+    def has_form(cls, modulus: int) -> bool:
+        """ True, если модуль имеет вид, для которого написана стратегия. """
+        return True
+
+    @classmethod
+    def detect(cls, modulus: int) -> bool:
+        """ True, если стратегию стоит выбрать для модуля автоматически:
+            модуль подходящего вида, и на нём она быстрее встроенного деления.
+        """
+        return cls.has_form(modulus)
+
+    def _make_reduce(self):
+        return self.modulus.__rmod__
+
+    def __repr__(self):
+        return '%s<0x%x>' % (self.name, self.modulus)
+
+
+class MersenneReduction(Reduction):
+    """ p = 2^k - 1: x = (x mod 2^k) + (x >> k), как для P-521. """
+    name = 'mersenne'
+
+    @classmethod
+    def has_form(cls, modulus: int) -> bool:
+        return modulus == (1 << modulus.bit_length()) - 1
+
+    @classmethod
+    def detect(cls, modulus: int) -> bool:
+        return cls.has_form(modulus) and \
+            (modulus.bit_length() >= SPECIALIZED_REDUCTION_MIN_BITS)
+
+    def _make_reduce(self):
+        p = self.modulus
+        k = p.bit_length()
+        mask = (1 << k) - 1
+
+        def reduce(x):
+            x = (x & mask) + (x >> k)
+            x = (x & mask) + (x >> k)
+            return x if 0 <= x < p else x % p
+
+        return reduce
+
+
+class PseudoMersenneReduction(Reduction):
+    """ p = 2^k - c с c < 2^(k / 2): x = (x mod 2^k) + (x >> k) * c, как
+        для secp256k1 (c = 2^32 + 977) и secp384r1. Автоматически
+        выбирается, только если c помещается в одну цифру длинного целого:
+        для больших c умножение на c съедает выигрыш.
+    """
+    name = 'pseudo-mersenne'
+
+    @classmethod
+    def has_form(cls, modulus: int) -> bool:
+        k = modulus.bit_length()
+        c = (1 << k) - modulus
+        return (c > 1) and (c.bit_length() <= k // 2)
+
+    @classmethod
+    def detect(cls, modulus: int) -> bool:
+        c = (1 << modulus.bit_length()) - modulus
+        return cls.has_form(modulus) and \
+            (modulus.bit_length() >= SPECIALIZED_REDUCTION_MIN_BITS) and \
+            (c.bit_length() <= _DIGIT_BITS)
+
+    def _make_reduce(self):
+        p = self.modulus
+        k = p.bit_length()
+        c = (1 << k) - p
+        mask = (1 << k) - 1
+
+        def reduce(x):
+            x = (x & mask) + (x >> k) * c
+            x = (x & mask) + (x >> k) * c
+            return x if 0 <= x < p else x % p
+
+        return reduce
+
+
+# стратегии специального вида, проверяемые по порядку при создании поля
+_detectors = [MersenneReduction, PseudoMersenneReduction]
+
+# выбранная стратегия для каждого модуля
+_reductions = {}
+
+
+def special_form_reductions() -> list:
+    """ Классы стратегий специального вида в порядке проверки. """
+    return list(_detectors)
+
+
+def register_detector(reduction_class):
+    """ Добавляет стратегию в начало списка автоматически проверяемых. """
+    _detectors.insert(0, reduction_class)
+
+
+def register_reduction(modulus: int, reduction_class):
+    """ Принудительно назначает стратегию для модуля. Действует на поля,
+        создаваемые после вызова.
+    """
+    _reductions[modulus] = reduction_class(modulus)
+
+
+def reduction_for(modulus: int) -> Reduction:
+    """ Стратегия приведения для модуля: зарегистрированная явно либо
+        первая подошедшая из списка, иначе встроенное деление.
+    """
+    reduction = _reductions.get(modulus)
+    if reduction is None:
+        reduction_class = next(
+            (cls for cls in _detectors if cls.detect(modulus)), Reduction
+        )
+        reduction = _reductions.setdefault(
+            modulus, reduction_class(modulus)
+        )
+    return reduction
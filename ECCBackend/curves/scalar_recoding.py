@@ -0,0 +1,60 @@
+def wnaf(scalar: int, width: int) -> list:
+    """ Представление скаляра в виде width-NAF: список цифр от младшей к
+        старшей. Каждая цифра — ноль либо нечётное число, по модулю меньшее
+        2^(width - 1), и среди любых width подряд идущих цифр не более одной
+        ненулевой.
+    """
+    assert (scalar >= 0) and (width >= 2)
+    window = 1 << width
+    half = 1 << (width - 1)
+    digits = []
+    while scalar > 0:
+        if scalar & 1:
+            digit = scalar & (window - 1)
+            if digit >= half:
+                digit -= window
+            scalar -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        scalar >>= 1
+    return digits
+
+
+def optimal_wnaf_width(bits: int, max_width: int = 8) -> int:
+    """ Ширина окна width-NAF, минимизирующая число сложений для скаляра
+        длины bits: 2^(width - 2) на предвычисления нечётных кратных и
+        около bits / (width + 1) в основном цикле.
+    """
+    return min(
+        range(2, max_width + 1),
+        key=lambda width: (1 << (width - 2)) + bits / (width + 1)
+    )
+
+
+def signed_window_digits(scalar: int, width: int) -> list:
+    """ Представление скаляра по основанию 2^width со знаковыми цифрами
+        из [-2^(width - 1), 2^(width - 1)]: список от младшей к старшей.
+    """
+    assert (scalar >= 0) and (width >= 1)
+    window = 1 << width
+    half = 1 << (width - 1)
+    digits = []
+    while scalar > 0:
+        digit = scalar & (window - 1)
+        if digit > half:
+            digit -= window
+        digits.append(digit)
+        scalar = (scalar - digit) >> width
+    return digits
+
+
+def optimal_pippenger_window(count: int, bits: int, max_width: int = 16) -> int:
+    """ Ширина окна метода Пиппенджера для count слагаемых со скалярами
+        длины bits, минимизирующая число сложений: на каждое из
+        bits / width окон — count сложений в корзины и 2^width на их свёртку.
+    """
+    return min(
+        range(1, max_width + 1),
+        key=lambda width: (bits / width) * (count + (1 << width))
+    )
@@ -0,0 +1,242 @@
+import concurrent.futures
+
+from ECCBackend.curves.point_counting import hasse_interval, \
+    mestre_curve_order
+from ECCBackend.curves.polynomial import PolynomialModulus, poly_divmod, \
+    poly_gcd, poly_gcdex, poly_mul, poly_neg, poly_scale, poly_sqr, \
+    poly_sub, poly_trim
+
+# Сколько значений #E в интервале Хассе оставляется шагам младенца —
+# гиганта (см. mestre_curve_order) вместо следующих, самых дорогих простых l
+SCHOOF_BSGS_CANDIDATES = 1 << 24
+
+# С какой длины модуля алгоритм Шуфа быстрее одного метода Шэнкса — Местре
+SCHOOF_MIN_BITS = 48
+
+# Наибольшая длина модуля в битах: 160-битная кривая считается минуты, а
+# время растёт примерно как пятая степень длины
+SCHOOF_MAX_BITS = 160
+
+
+class _TorsionFactor(Exception):
+    """ Необратимый знаменатель: найден нетривиальный делитель factor
+        многочлена деления, вычисления продолжаются по модулю него.
+    """
+    def __init__(self, factor):
+        Exception.__init__(self, factor)
+        self.factor = factor
+
+
+def division_polynomials(a: int, b: int, p: int, n: int) -> dict:
+    """ Многочлены деления кривой y^2 = x^3 + a x + b, нужные для psi_n,
+        в виде словаря k -> F_k(x): psi_k = F_k при нечётном k и
+        psi_k = 2y F_k при чётном. Строятся по удвоительным формулам
+        только для индексов, через которые выражается n.
+    """
+    f_sq16 = poly_scale(poly_sqr(poly_trim([b % p, a % p, 0, 1]), p), 16, p)
+    polys = {
+        0: [],
+        1: [1],
+        2: [1],
+        3: poly_trim([(-a * a) % p, 12 * b % p, 6 * a % p, 0, 3 % p]),
+        4: poly_trim([
+            2 * (-8 * b * b - a ** 3) % p, -8 * a * b % p,
+            -10 * a * a % p, 40 * b % p, 10 * a % p, 0, 2 % p
+        ]),
+    }
+
+    def cube(poly):
+        return poly_mul(poly_sqr(poly, p), poly, p)
+
+    def get(k):
+        poly = polys.get(k)
+        if poly is not None:
+            return poly
+        m = k // 2
+        if k & 1:
+            # psi_{2m+1} = psi_{m+2} psi_m^3 - psi_{m-1} psi_{m+1}^3,
+            # (2y)^4 = 16 f^2 у чётных сомножителей
+            left = poly_mul(get(m + 2), cube(get(m)), p)
+            right = poly_mul(get(m - 1), cube(get(m + 1)), p)
+            if m & 1:
+                right = poly_mul(f_sq16, right, p)
+            else:
+                left = poly_mul(f_sq16, left, p)
+            poly = poly_sub(left, right, p)
+        else:
+            # 2y psi_{2m} = psi_m (psi_{m+2} psi_{m-1}^2 -
+            # psi_{m-2} psi_{m+1}^2)
+            poly = poly_mul(get(m), poly_sub(
+                poly_mul(get(m + 2), poly_sqr(get(m - 1), p), p),
+                poly_mul(get(m - 2), poly_sqr(get(m + 1), p), p), p
+            ), p)
+        polys[k] = poly
+        return poly
+
+    get(n)
+    return polys
+
+
+class _TorsionRing:
+    """ Точки (X(x), y Y(x)) кривой над F_p[x, y] / (h(x), y^2 - f(x)),
+        где h делит многочлен деления psi_l; None — нейтральный элемент.
+        Обращение в F_p[x] / (h) расширенным алгоритмом Евклида; если
+        знаменатель необратим, бросается _TorsionFactor.
+    """
+    def __init__(self, h: list, a: int, b: int, p: int):
+        self.ring = PolynomialModulus(h, p)
+        self.p = p
+        self.a = a % p
+        self.f = self.ring.reduce(poly_trim([b % p, a % p, 0, 1]))
+
+    def inverse(self, value: list) -> list:
+        g, s = poly_gcdex(value, self.ring.modulus, self.p)
+        if len(g) != 1:
+            raise _TorsionFactor(g or self.ring.modulus)
+        return s
+
+    def add(self, point1, point2):
+        if point1 is None:
+            return point2
+        if point2 is None:
+            return point1
+        ring, p = self.ring, self.p
+        x1, y1 = point1
+        x2, y2 = point2
+        if x1 == x2:
+            if y1 != y2:
+                if y1 == poly_neg(y2, p):
+                    return None
+                raise _TorsionFactor(
+                    poly_gcd(ring.sub(y1, y2), ring.modulus, p)
+                )
+            if not y1:
+                return None
+            # lambda = y (3 x^2 + a) / (2 f Y)
+            numerator = ring.add(poly_scale(ring.sqr(x1), 3, p), [self.a])
+            slope = ring.mul(numerator, self.inverse(
+                poly_scale(ring.mul(self.f, y1), 2, p)
+            ))
+        else:
+            # lambda = y (Y1 - Y2) / (X1 - X2)
+            slope = ring.mul(ring.sub(y1, y2), self.inverse(ring.sub(x1, x2)))
+        x3 = ring.sub(ring.sub(ring.mul(self.f, ring.sqr(slope)), x1), x2)
+        y3 = ring.sub(ring.mul(slope, ring.sub(x1, x3)), y1)
+        return x3, y3
+
+    def multiply(self, point, scalar: int):
+        result = None
+        for bit in bin(scalar)[2:]:
+            result = self.add(result, result)
+            if bit == '1':
+                result = self.add(result, point)
+        return result
+
+
+def _trace_mod_factor(a: int, b: int, p: int, ell: int, h: list) -> int:
+    """ t mod l по многочлену h, делящему psi_l: ищется t, для которого
+        pi^2(P) + (p mod l) P = t pi(P) на l-кручении.
+    """
+    torsion = _TorsionRing(h, a, b, p)
+    ring = torsion.ring
+    x = ring.reduce([0, 1])
+    x_p = ring.pow(x, p)
+    y_p = ring.pow(torsion.f, (p - 1) // 2)
+    frobenius = (x_p, y_p)
+    # pi^2 = (x^(p^2), y f^((p^2 - 1) / 2)): композиция с x^p вместо ещё
+    # одного возведения в степень p
+    frobenius_sq = (
+        ring.compose(x_p, x_p), ring.mul(y_p, ring.compose(y_p, x_p))
+    )
+    target = torsion.add(
+        frobenius_sq, torsion.multiply((x, [1]), p % ell)
+    )
+    if target is None:
+        return 0
+    multiple = frobenius
+    for t in range(1, (ell - 1) // 2 + 1):
+        if multiple[0] == target[0]:
+            if multiple[1] == target[1]:
+                return t
+            if multiple[1] == poly_neg(target[1], p):
+                return ell - t
+            raise _TorsionFactor(
+                poly_gcd(ring.sub(multiple[1], target[1]), ring.modulus, p)
+            )
+        multiple = torsion.add(multiple, frobenius)
+    raise Exception('Frobenius trace mod %d is not found' % ell)
+
+
+def trace_mod_prime(a: int, b: int, p: int, ell: int) -> int:
+    """ След Фробениуса t = p + 1 - #E по модулю простого l != p
+        (алгоритм Шуфа). Для l = 2: t чётно, если x^3 + a x + b имеет
+        корень в F_p, то есть gcd(x^p - x, f) != 1.
+    """
+    f = poly_trim([b % p, a % p, 0, 1])
+    if ell == 2:
+        x_p = PolynomialModulus(f, p).pow([0, 1], p)
+        root = poly_gcd(f, poly_sub(x_p, [0, 1], p), p)
+        return 0 if len(root) > 1 else 1
+    h = division_polynomials(a, b, p, ell)[ell]
+    while True:
+        try:
+            return _trace_mod_factor(a, b, p, ell, h)
+        except _TorsionFactor as exc:
+            # t mod l одинаков на всём l-кручении: достаточно меньшего
+            # из двух делителей h
+            factor = exc.factor
+            cofactor = poly_divmod(h, factor, p)[0]
+            h = min(factor, cofactor, key=len)
+
+
+def schoof_primes(p: int) -> list:
+    """ Простые l, по которым t mod l находится алгоритмом Шуфа: пока в
+        интервале Хассе остаётся больше SCHOOF_BSGS_CANDIDATES значений #E.
+    """
+    low, high = hasse_interval(p)
+    primes = []
+    product = 1
+    candidate = 2
+    while (high - low + 1) // product > SCHOOF_BSGS_CANDIDATES:
+        if all(candidate % prime for prime in primes) and candidate != p:
+            primes.append(candidate)
+            product *= candidate
+        candidate += 1
+    return primes
+
+
+def schoof_curve_order(curve, max_workers: int = None,
+                       mp_context=None) -> int:
+    """ #E(F_p) алгоритмом Шуфа: t mod l для малых простых l
+        (schoof_primes) по многочленам деления, затем CRT и шаги
+        младенца — гиганта по оставшимся кандидатам в интервале Хассе.
+        По умолчанию вычисления идут в вызывающем процессе; если явно
+        задан max_workers больше 1, простые l, от самых дорогих,
+        распределяются по процессам ProcessPoolExecutor с контекстом
+        mp_context. ValueError для модулей длиннее SCHOOF_MAX_BITS бит.
+    """
+    p = curve.modulus
+    if p.bit_length() > SCHOOF_MAX_BITS:
+        raise ValueError(
+            'Schoof point counting supports moduli up to %d bits.'
+            % SCHOOF_MAX_BITS
+        )
+    a, b = int(curve.a), int(curve.b)
+    primes = sorted(schoof_primes(p), reverse=True)
+    workers = min(max_workers or 1, max(len(primes), 1))
+    if workers == 1:
+        traces = [trace_mod_prime(a, b, p, ell) for ell in primes]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=mp_context) as executor:
+            traces = list(executor.map(
+                trace_mod_prime, *zip(*[(a, b, p, ell) for ell in primes])
+            ))
+    residue, modulus = 0, 1
+    for ell, t in zip(primes, traces):
+        # t = residue mod modulus и t = t_l mod l
+        k = (t - residue) * pow(modulus, -1, ell) % ell
+        residue, modulus = residue + modulus * k, modulus * ell
+    return mestre_curve_order(
+        curve, curve.quadratic_twist(), modulus, (p + 1 - residue) % modulus
+    )
@@ -0,0 +1,127 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Модули меньше 2^32: произведение двух остатков помещается в uint64
+NUMPY_MAX_MODULUS = 1 << 32
+
+# Число абсцисс, обрабатываемых за один векторный проход
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def numpy_supports(modulus: int) -> bool:
+    """ True, если NumPy установлен и остатки по модулю помещаются в
+        машинное слово так, что их произведение не переполняет uint64.
+    """
+    return numpy is not None and modulus < NUMPY_MAX_MODULUS
+
+
+def pow_mod(base, exponent: int, modulus: int):
+    """ Поэлементное base^exponent mod modulus для массива uint64. """
+    result = numpy.ones_like(base)
+    square = base.copy()
+    while exponent:
+        if exponent & 1:
+            result = result * square % modulus
+        square = square * square % modulus
+        exponent >>= 1
+    return result
+
+
+def weierstrass_rhs(xs, a: int, b: int, modulus: int):
+    """ x^3 + a x + b mod p для массива абсцисс uint64. """
+    p = numpy.uint64(modulus)
+    x2 = xs * xs % p
+    return (x2 * xs % p + numpy.uint64(a) * xs % p + numpy.uint64(b)) % p
+
+
+def legendre_array(values, modulus: int):
+    """ Символы Лежандра массива значений по критерию Эйлера: int8 из
+        {-1, 0, 1}.
+    """
+    symbols = pow_mod(values, (modulus - 1) // 2, modulus)
+    return numpy.where(
+        symbols == modulus - 1, -1, symbols.astype(numpy.int64)
+    ).astype(numpy.int8)
+
+
+def sqrt_array(values, field):
+    """ Квадратные корни массива вычетов поля field: одно возведение в
+        степень для p = 3 mod 4, иначе алгоритм Тонелли — Шэнкса для всех
+        элементов сразу (элементы, для которых цикл закончился, не
+        меняются).
+    """
+    p = field.p
+    if (p % 4) == 3:
+        return pow_mod(values, (p + 1) // 4, p)
+    q, s, c = field._tonelli_shanks_constants()
+    r = pow_mod(values, (q + 1) // 2, p)
+    t = pow_mod(values, q, p)
+    c = numpy.full_like(values, c)
+    m = numpy.full(values.shape, s, dtype=numpy.int64)
+    while True:
+        active = t != 1
+        if not active.any():
+            return r
+        # наименьшее i с t^(2^i) = 1
+        i = numpy.zeros(values.shape, dtype=numpy.int64)
+        found = ~active
+        t2 = t
+        for step in range(1, s):
+            t2 = t2 * t2 % p
+            newly = ~found & (t2 == 1)
+            i[newly] = step
+            found |= newly
+        # b = c^(2^(m - i - 1))
+        exponent = numpy.where(active, m - i - 1, 0)
+        b = c
+        for step in range(int(exponent.max())):
+            b = numpy.where(step < exponent, b * b % p, b)
+        b2 = b * b % p
+        r = numpy.where(active, r * b % p, r)
+        c = numpy.where(active, b2, c)
+        t = numpy.where(active, t * b2 % p, t)
+        m = numpy.where(active, i, m)
+
+
+def weierstrass_point_arrays(curve, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """ Аффинные точки кривой Вейерштрасса массивами (xs, ys) uint64 по
+        порциям из chunk_size абсцисс; нейтральный элемент не включается.
+        Для каждой абсциссы-вычета выдаются обе точки, для y = 0 — одна.
+    """
+    p = curve.modulus
+    assert (numpy_supports(p))
+    field = curve.field
+    a, b = int(curve.a), int(curve.b)
+    for start in range(0, p, chunk_size):
+        xs = numpy.arange(
+            start, min(start + chunk_size, p), dtype=numpy.uint64
+        )
+        rhs = weierstrass_rhs(xs, a, b, p)
+        symbols = legendre_array(rhs, p)
+        residues = symbols == 1
+        roots = sqrt_array(rhs[residues], field)
+        xs_residues = xs[residues]
+        yield (
+            numpy.concatenate((xs[symbols == 0], xs_residues, xs_residues)),
+            numpy.concatenate((
+                numpy.zeros(int((symbols == 0).sum()), dtype=numpy.uint64),
+                roots, (p - roots) % p
+            ))
+        )
+
+
+def weierstrass_count_points(curve, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """ #E = 1 + sum_x (1 + (x^3 + a x + b / p)) по порциям абсцисс. """
+    p = curve.modulus
+    assert (numpy_supports(p))
+    a, b = int(curve.a), int(curve.b)
+    count = 1
+    for start in range(0, p, chunk_size):
+        xs = numpy.arange(
+            start, min(start + chunk_size, p), dtype=numpy.uint64
+        )
+        symbols = legendre_array(weierstrass_rhs(xs, a, b, p), p)
+        count += len(xs) + int(symbols.sum(dtype=numpy.int64))
+    return count
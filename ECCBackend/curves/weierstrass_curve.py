@@ -1,8 +1,16 @@
 import collections
 
 from ECCBackend.curves.ec import EllipticCurve
+from ECCBackend.curves.endomorphism_operations import GLVEndomorphism
 from ECCBackend.curves.field_element import FieldElement
+from ECCBackend.curves.jacobian_operations import JacobianArithmetic
 from ECCBackend.curves.point import Point
+from ECCBackend.curves.point_counting import BSGS_MIN_MODULUS, \
+    mestre_curve_order
+from ECCBackend.curves.point_operations import ScalarMultiplicationXOnly
+from ECCBackend.curves.schoof import SCHOOF_MIN_BITS, schoof_curve_order
+from ECCBackend.curves.vectorized import DEFAULT_CHUNK_SIZE, numpy_supports, \
+    weierstrass_count_points, weierstrass_point_arrays
 
 _WeierstrassCurveDomainParameters = collections.namedtuple(
     'WeierstrassCurveDomainParameters',
@@ -10,7 +18,11 @@ _WeierstrassCurveDomainParameters = collections.namedtuple(
 )
 
 
-class WeierstrassCurve(EllipticCurve):
+class WeierstrassCurve(JacobianArithmetic, GLVEndomorphism,
+                       ScalarMultiplicationXOnly, EllipticCurve):
+    # методы Шуфа и Шэнкса — Местре считают #E таких кривых за секунды
+    AUTO_CURVE_ORDER_MAX_BITS = 64
+
     def __init__(self, a: int, b: int,
                  modulus, order, cofactor, gen_x, gen_y, **kwargs):
         EllipticCurve.__init__(
@@ -18,7 +30,13 @@ class WeierstrassCurve(EllipticCurve):
         )
         self._a = FieldElement(a, modulus)
         self._b = FieldElement(b, modulus)
-        self._name = kwargs.get('name')
+
+        # коэффициенты как целые числа и признаки сокращённого удвоения
+        self._a_int = int(self._a)
+        self._b_int = int(self._b)
+        self._a_is_zero = self._a_int == 0
+        self._a_is_minus_3 = self._a_int == modulus - 3
+        self._glv = None
 
         # кривая не вырождена
         assert ((4 * (self.a ** 3)) + (27 * (self.b ** 2)) != 0)
@@ -27,7 +45,13 @@ class WeierstrassCurve(EllipticCurve):
             assert (self._gen.on_curve())
 
             if self.order is not None:
-                assert (self.order * self.gen).is_neutral
+                # без таблицы генератора: она приводит скаляр по модулю order
+                assert self.from_jacobian(
+                    self.jacobian_double_and_add(self.gen, self.order)
+                ).is_neutral
+
+        # эндоморфизм для кривых Коблица с a = 0
+        self._glv = self._setup_glv()
 
     @property
     def is_anomalous(self):
@@ -66,14 +90,89 @@ class WeierstrassCurve(EllipticCurve):
             security_bits -= 4
         return security_bits
 
+    def _rhs_chunks(self, chunk_size: int):
+        """ Пары (x, x^3 + a x + b) по порциям из chunk_size абсцисс. """
+        p = self.field.p
+        a, b = self._a_int, self._b_int
+        for start in range(0, p, chunk_size):
+            xs = range(start, min(start + chunk_size, p))
+            yield xs, [(x * x * x + a * x + b) % p for x in xs]
+
     def enumerate_points(self):
-        """ Возвращает enumeration точек. """
+        """ Возвращает enumeration точек. Абсциссы точек отбираются вызовом
+            legendre_batch по правым частям уравнения порциями по
+            DEFAULT_CHUNK_SIZE.
+        """
         yield self.neutral()
-        for x in range(self.modulus):
-            points = self.get_point_with_x(x)
-            if points is not None:
-                yield points[0]
-                yield points[1]
+        field = self.field
+        for xs, rhs in self._rhs_chunks(DEFAULT_CHUNK_SIZE):
+            for x, y_sq, symbol in zip(xs, rhs, field.legendre_batch(rhs)):
+                if symbol == 0:
+                    # точка второго порядка (x, 0)
+                    yield Point(x, 0, self)
+                elif symbol == 1:
+                    y = field.sqrt(y_sq)
+                    if y & 1:
+                        y = field.neg(y)
+                    yield Point(x, y, self)
+                    yield Point(x, field.neg(y), self)
+
+    def point_arrays(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """ Аффинные точки массивами NumPy (xs, ys) по порциям абсцисс, без
+            объектов Point; нейтральный элемент не включается. Требует
+            NumPy и модуль меньше NUMPY_MAX_MODULUS.
+        """
+        if not numpy_supports(self.modulus):
+            raise ValueError(
+                'Vectorized enumeration needs NumPy and a modulus '
+                'below 2^32.'
+            )
+        return weierstrass_point_arrays(self, chunk_size)
+
+    def count_points(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """ #E = 1 + sum_x (1 + символ Лежандра x^3 + a x + b) без
+            создания точек: векторно через NumPy, если модуль помещается в
+            машинное слово, иначе порциями через legendre_batch. Память
+            ограничена размером порции.
+        """
+        if numpy_supports(self.modulus):
+            return weierstrass_count_points(self, chunk_size)
+        count = 1
+        for xs, rhs in self._rhs_chunks(chunk_size):
+            count += len(xs) + sum(self.field.legendre_batch(rhs))
+        return count
+
+    def naive_order_calculation(self):
+        return self.count_points()
+
+    def count_curve_order(self, max_workers: int = None) -> int:
+        """ #E(F_p): перебором абсцисс для малых модулей, алгоритмом
+            Шуфа для модулей от SCHOOF_MIN_BITS бит (см. schoof_curve_order;
+            max_workers — число процессов для него), иначе методом
+            Шэнкса — Местре (см. mestre_curve_order). Известный порядок
+            генератора используется как делитель #E.
+        """
+        if self.modulus < BSGS_MIN_MODULUS:
+            return self.count_points()
+        if self.order is None and \
+                self.modulus.bit_length() >= SCHOOF_MIN_BITS:
+            return schoof_curve_order(self, max_workers)
+        divisor = 1 if self.order is None else self.order
+        return mestre_curve_order(self, self.quadratic_twist(), divisor)
+
+    def quadratic_twist(self):
+        """ Квадратичное кручение y^2 = x^3 + a d^2 x + b d^3 с
+            квадратичным невычетом d; #E + #E' = 2p + 2.
+        """
+        field = self.field
+        d = 2
+        while field.is_qr(d):
+            d += 1
+        d_sq = field.sqr(d)
+        return WeierstrassCurve(
+            field.mul(self._a_int, d_sq), field.mul(self._b_int, d_sq * d),
+            self.modulus, None, None, None, None
+        )
 
     @property
     def a(self):
@@ -95,21 +194,66 @@ class WeierstrassCurve(EllipticCurve):
         """ Возвращает кортеж из двух точек с заданной компонентой x,
             удовлетворящих уровнению кривой. Если их не существовует, то — None.
         """
-        y_sq = ((FieldElement(x, self._modulus) ** 3) + (self._a * x) + self._b)
-        y = y_sq.sqrt()
-        if y:
-            return Point(x, int(y[0]), self), Point(x, int(y[1]), self)
-        else:
+        field = self.field
+        x %= field.p
+        y_sq = field.reduce(x * x * x + self._a_int * x + self._b_int)
+        # символ Якоби отсеивает невычеты дешевле, чем попытка извлечь корень
+        if not field.is_qr(y_sq):
             return None
+        y = field.sqrt(y_sq)
+        if y & 1:
+            y = field.neg(y)
+        return Point(x, y, self), Point(x, field.neg(y), self)
+
+    def decode_point(self, data: bytes):
+        """ Точка из кодировки SEC1 (см. Point.encode). Для сжатой формы
+            y восстанавливается одним квадратным корнем. ValueError, если
+            данные не задают точку кривой.
+        """
+        data = bytes(data)
+        length = self.coordinate_length
+        if data == b'\x00':
+            return self.neutral()
+        prefix = data[:1]
+        if prefix in (b'\x02', b'\x03') and len(data) == 1 + length:
+            field = self.field
+            x = int.from_bytes(data[1:], byteorder='big')
+            if x >= field.p:
+                raise ValueError('Coordinate is out of range.')
+            y = field.sqrt(x * x * x + self._a_int * x + self._b_int)
+            if y is None:
+                raise ValueError('Point is not on the curve.')
+            if (y & 1) != (data[0] & 1):
+                y = field.neg(y)
+            if (y & 1) != (data[0] & 1):
+                # y = 0 имеет только чётный корень
+                raise ValueError('Point is not on the curve.')
+            return Point(x, y, self)
+        if prefix == b'\x04' and len(data) == 1 + 2 * length:
+            x = int.from_bytes(data[1:1 + length], byteorder='big')
+            y = int.from_bytes(data[1 + length:], byteorder='big')
+            if x >= self.modulus or y >= self.modulus:
+                raise ValueError('Coordinate is out of range.')
+            point = Point(x, y, self)
+            if not self.on_curve(point):
+                raise ValueError('Point is not on the curve.')
+            return point
+        raise ValueError('Invalid SEC1 point encoding.')
 
     def on_curve(self, point):
         """ True, если точка point лежит на данной кривой, иначе False. """
-        return point.is_neutral or \
-            ((point.y ** 2) == (point.x ** 3) + (self.a * point.x) + self.b)
+        if point.is_neutral:
+            return True
+        x, y = int(point.x), int(point.y)
+        return self.field.reduce(
+            y * y - x * x * x - self._a_int * x - self._b_int
+        ) == 0
 
     def point_conjugate(self, point):
         """ Возвращает точку -point для данной точки point. """
-        return Point(int(point.x), int(-point.y), self)
+        if point.is_neutral:
+            return point
+        return Point(int(point.x), self.field.neg(int(point.y)), self)
 
     def point_addition(self, point1, point2):
         """ Возвращает результат сложения двух точек. """
@@ -119,20 +263,28 @@ class WeierstrassCurve(EllipticCurve):
         if point2.is_neutral:
             # point1 + O = point1
             return point1
-        if point1 == -point2:
-            # point1 = -point2 (бесконечность)
-            return self.neutral()
-        if point1 == point2:
+        field = self.field
+        red = field.reduce
+        x1, y1 = int(point1.x), int(point1.y)
+        x2, y2 = int(point2.x), int(point2.y)
+        if x1 == x2:
+            if y1 != y2 or y1 == 0:
+                # point1 = -point2 (бесконечность)
+                return self.neutral()
             # point1 = point2
-            s = ((3 * point1.x ** 2) + self.a) // (2 * point1.y)
-            new_x = s * s - (2 * point1.x)
-            new_y = s * (point1.x - new_x) - point1.y
-            return Point(int(new_x), int(new_y), self)
-        # point1 != point2
-        s = (point1.y - point2.y) // (point1.x - point2.x)
-        new_x = (s ** 2) - point1.x - point2.x
-        new_y = s * (point1.x - new_x) - point1.y
-        return Point(int(new_x), int(new_y), self)
+            s = red((3 * x1 * x1 + self._a_int) * field.inv(2 * y1))
+        else:
+            # point1 != point2
+            s = red((y1 - y2) * field.inv(x1 - x2))
+        new_x = red(s * s - x1 - x2)
+        new_y = red(s * (x1 - new_x) - y1)
+        return Point(new_x, new_y, self)
+
+    def point_multiplication(self, point, scalar: int):
+        """ Умножение точки на скаляр в якобиевых координатах с одним
+            обращением в конце.
+        """
+        return self.from_jacobian(self.jacobian_multiply(point, scalar))
 
     def __str__(self):
         if self.has_name:
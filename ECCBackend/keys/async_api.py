@@ -0,0 +1,224 @@
+import asyncio
+import functools
+
+from ECCBackend.keys.public_key_operations import ecdsa_verify_batch
+
+# Сколько вычислений одновременно передаётся исполнителю
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Наибольший размер пакета проверок подписей
+DEFAULT_MAX_BATCH = 256
+
+# Сколько секунд запрос на проверку ждёт попутчиков для пакета
+DEFAULT_BATCH_DELAY = 0.002
+
+
+def _verify_each(items) -> list:
+    """ Проверяет тройки (public_key, message, signature) по одной тем же
+        ecdsa_verify_batch, что и пакет, чтобы подпись вне диапазона и
+        здесь давала False: для каждой — пара (результат, None) либо
+        (None, исключение).
+    """
+    outcomes = []
+    for item in items:
+        try:
+            result = ecdsa_verify_batch([item])[0]
+        except Exception as exc:
+            outcomes.append((None, exc))
+        else:
+            outcomes.append((result, None))
+    return outcomes
+
+
+class _LoopState:
+    """ Состояние фасада, привязанное к одному циклу событий. """
+    def __init__(self, loop, max_concurrency: int):
+        self.loop = loop
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.pending = []
+        self.flush_handle = None
+        self.tasks = set()
+
+
+class AsyncECC:
+    """ Асинхронный фасад для ECDSA, ECDH и ECIES. Вычисления выполняются в
+        исполнителе executor (None — исполнитель цикла событий по умолчанию),
+        не более max_concurrency одновременно, так что цикл событий не
+        блокируется. Одновременные запросы на проверку подписей собираются
+        в пакеты до max_batch штук с ожиданием не дольше batch_delay секунд
+        и проверяются одним вызовом ecdsa_verify_batch. Для
+        ProcessPoolExecutor ключи и сообщения должны сериализоваться pickle;
+        для массовой работы по процессам см. ProcessEngine.
+    """
+    def __init__(self, executor=None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 batch_delay: float = DEFAULT_BATCH_DELAY):
+        assert (max_concurrency > 0)
+        assert (max_batch > 0)
+        assert (batch_delay >= 0)
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        self._max_batch = max_batch
+        self._batch_delay = batch_delay
+        self._loop_state = None
+
+    @property
+    def executor(self):
+        return self._executor
+
+    @property
+    def max_concurrency(self):
+        return self._max_concurrency
+
+    @property
+    def max_batch(self):
+        return self._max_batch
+
+    @property
+    def batch_delay(self):
+        return self._batch_delay
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        if self._loop_state is None or self._loop_state.loop is not loop:
+            self._loop_state = _LoopState(loop, self._max_concurrency)
+        return self._loop_state
+
+    async def _run(self, fn, *args, **kwargs):
+        state = self._state()
+        async with state.semaphore:
+            return await state.loop.run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+
+    async def sign(self, private_key, message, digest_name: str, nonce=None):
+        return await self._run(
+            private_key.ecdsa_sign, message, digest_name, nonce=nonce
+        )
+
+    async def sign_hash(self, private_key, message_digest: bytes,
+                        digest_name: str = None, nonce: int = None):
+        return await self._run(
+            private_key.ecdsa_sign_hash, message_digest,
+            digest_name=digest_name, nonce=nonce
+        )
+
+    async def verify(self, public_key, message, signature) -> bool:
+        """ Проверка подписи в составе ближайшего пакета. """
+        state = self._state()
+        future = state.loop.create_future()
+        state.pending.append((public_key, message, signature, future))
+        if len(state.pending) >= self._max_batch:
+            self._flush(state)
+        elif state.flush_handle is None:
+            state.flush_handle = state.loop.call_later(
+                self._batch_delay, self._flush, state
+            )
+        return await future
+
+    async def verify_many(self, items) -> list:
+        """ Проверка троек (public_key, message, signature) одним пакетом.
+        """
+        return await self._run(ecdsa_verify_batch, list(items))
+
+    async def ecdh(self, private_key, peer_pubkey):
+        return await self._run(private_key.ecdh_compute, peer_pubkey)
+
+    async def ecdh_x(self, private_key, peer_pubkey, recover_y: bool = False):
+        return await self._run(
+            private_key.ecdh_compute_x, peer_pubkey, recover_y=recover_y
+        )
+
+    async def ecies_encrypt(self, public_key, r: int = None):
+        return await self._run(public_key.ecies_encrypt, r)
+
+    async def ecies_decrypt(self, private_key, r):
+        return await self._run(private_key.ecies_decrypt, r)
+
+    def _flush(self, state):
+        if state.flush_handle is not None:
+            state.flush_handle.cancel()
+            state.flush_handle = None
+        batch, state.pending = state.pending, []
+        if batch:
+            task = state.loop.create_task(self._verify_batch(batch))
+            state.tasks.add(task)
+            task.add_done_callback(state.tasks.discard)
+
+    async def _verify_batch(self, batch):
+        """ Проверяет пакет одним вызовом ecdsa_verify_batch. Если он
+            бросает исключение (например, из-за неизвестного hashalg в одном
+            из запросов), тройки проверяются по одной, и каждый запрос
+            получает свой результат или своё исключение.
+        """
+        items = [
+            (public_key, message, signature)
+            for public_key, message, signature, _ in batch
+        ]
+        try:
+            outcomes = [
+                (result, None)
+                for result in await self._run(ecdsa_verify_batch, items)
+            ]
+        except Exception:
+            try:
+                outcomes = await self._run(_verify_each, items)
+            except Exception as exc:
+                outcomes = [(None, exc)] * len(batch)
+        for (*_, future), (result, exc) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+_default_facade = AsyncECC()
+
+
+def configure(**kwargs):
+    """ Заменяет фасад по умолчанию новым AsyncECC(**kwargs). """
+    global _default_facade
+    _default_facade = AsyncECC(**kwargs)
+    return _default_facade
+
+
+def default_facade():
+    return _default_facade
+
+
+async def async_sign(private_key, message, digest_name: str, nonce=None):
+    return await _default_facade.sign(private_key, message, digest_name, nonce)
+
+
+async def async_sign_hash(private_key, message_digest: bytes,
+                          digest_name: str = None, nonce: int = None):
+    return await _default_facade.sign_hash(
+        private_key, message_digest, digest_name, nonce
+    )
+
+
+async def async_verify(public_key, message, signature) -> bool:
+    return await _default_facade.verify(public_key, message, signature)
+
+
+async def async_verify_many(items) -> list:
+    return await _default_facade.verify_many(items)
+
+
+async def async_ecdh(private_key, peer_pubkey):
+    return await _default_facade.ecdh(private_key, peer_pubkey)
+
+
+async def async_ecdh_x(private_key, peer_pubkey, recover_y: bool = False):
+    return await _default_facade.ecdh_x(private_key, peer_pubkey, recover_y)
+
+
+async def async_ecies_encrypt(public_key, r: int = None):
+    return await _default_facade.ecies_encrypt(public_key, r)
+
+
+async def async_ecies_decrypt(private_key, r):
+    return await _default_facade.ecies_decrypt(private_key, r)
@@ -0,0 +1,180 @@
+import collections
+import os
+import threading
+
+from ECCBackend.curves.prime_field import PrimeField
+from ECCBackend.secure_random import rand_ints
+
+# Верхняя граница числа готовых кортежей в пуле по умолчанию
+DEFAULT_HIGH_WATER = 256
+
+# Сколько кортежей вычисляется за один проход (одно обращение на всех)
+DEFAULT_CHUNK = 32
+
+# Эфемерный скаляр k, k^-1 mod n и точка k * G
+Ephemeral = collections.namedtuple('Ephemeral', ['scalar', 'inverse', 'point'])
+
+PoolStatistics = collections.namedtuple(
+    'PoolStatistics', ['taken', 'produced', 'empty', 'ready']
+)
+
+
+def make_ephemerals(curve, count: int) -> list:
+    """ count новых случайных кортежей Ephemeral. Обратные по модулю
+        порядка и аффинные координаты k * G находятся одним обращением
+        каждые (трюк Монтгомери).
+    """
+    order = curve.order
+    scalars = [k + 1 for k in rand_ints(order - 1, count)]
+    inverses = PrimeField.get(order).batch_inv(scalars)
+    affine = curve.jacobian_to_affine_batch(
+        [curve.jacobian_multiply(curve.gen, k) for k in scalars]
+    )
+    return [
+        Ephemeral(k, k_inv, curve.point(*xy))
+        for k, k_inv, xy in zip(scalars, inverses, affine)
+    ]
+
+
+def draw_ephemeral(curve, pool=None):
+    """ Эфемерный кортеж из пула pool (по умолчанию — из пула кривой);
+        если пула нет, кортеж вычисляется на месте.
+    """
+    if pool is None:
+        pool = curve.nonce_pool
+    if pool is not None:
+        return pool.take()
+    return make_ephemerals(curve, 1)[0]
+
+
+class EphemeralPool:
+    """ Пул заранее вычисленных кортежей (k, k^-1 mod n, k * G) для подписи
+        и шифрования. Фоновый поток пополняет пул до high_water, когда в нём
+        остаётся меньше low_water кортежей; если пул пуст, take вычисляет
+        кортеж на месте. Каждый кортеж выдаётся не более одного раза: он
+        извлекается из очереди атомарно, а после fork дочерний процесс
+        отбрасывает унаследованные кортежи, чтобы не повторить nonce
+        родителя. Поток разделяет GIL с вызывающим кодом, поэтому пул
+        снижает задержку запроса, но не общую нагрузку на процессор.
+    """
+    def __init__(self, curve, high_water: int = DEFAULT_HIGH_WATER,
+                 low_water: int = None, chunk: int = DEFAULT_CHUNK,
+                 start: bool = True):
+        assert (curve.has_generator and curve.order is not None)
+        assert (high_water > 0)
+        if low_water is None:
+            low_water = high_water // 2
+        assert (0 <= low_water <= high_water)
+        assert (chunk > 0)
+        self._curve = curve
+        self._high_water = high_water
+        self._low_water = low_water
+        self._chunk = chunk
+        self._taken = 0
+        self._produced = 0
+        self._empty = 0
+        self._reset()
+        if start:
+            self.start()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._items = collections.deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            # кортежи родителя остаются у родителя
+            running = self._thread is not None
+            self._reset()
+            if running:
+                self.start()
+
+    @property
+    def curve(self):
+        return self._curve
+
+    @property
+    def high_water(self):
+        return self._high_water
+
+    @property
+    def low_water(self):
+        return self._low_water
+
+    @property
+    def statistics(self):
+        """ Число выданных, вычисленных в фоне и выданных из пустого пула
+            кортежей.
+        """
+        return PoolStatistics(
+            taken=self._taken,
+            produced=self._produced,
+            empty=self._empty,
+            ready=len(self._items)
+        )
+
+    def start(self):
+        """ Запускает фоновый поток пополнения. """
+        self._check_fork()
+        if self._thread is not None:
+            return
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='EphemeralPool', daemon=True
+        )
+        self._thread.start()
+        self._wake.set()
+
+    def close(self):
+        """ Останавливает фоновый поток и отбрасывает готовые кортежи. """
+        self._closed = True
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            thread.join()
+        self._items.clear()
+
+    def fill(self):
+        """ Синхронно пополняет пул до high_water. """
+        self._check_fork()
+        self._refill()
+
+    def take(self):
+        """ Возвращает новый кортеж Ephemeral. """
+        self._check_fork()
+        try:
+            ephemeral = self._items.popleft()
+        except IndexError:
+            self._empty += 1
+            ephemeral = make_ephemerals(self._curve, 1)[0]
+        self._taken += 1
+        if len(self._items) < self._low_water:
+            self._wake.set()
+        return ephemeral
+
+    def __len__(self):
+        return len(self._items)
+
+    def _refill(self):
+        while not self._closed:
+            missing = self._high_water - len(self._items)
+            if missing <= 0:
+                break
+            ephemerals = make_ephemerals(
+                self._curve, min(missing, self._chunk)
+            )
+            self._items.extend(ephemerals)
+            self._produced += len(ephemerals)
+
+    def _run(self):
+        items, wake = self._items, self._wake
+        while True:
+            wake.wait()
+            wake.clear()
+            # после fork или close поток относится к другой очереди
+            if self._closed or items is not self._items:
+                return
+            self._refill()
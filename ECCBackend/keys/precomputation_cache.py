@@ -0,0 +1,221 @@
+import collections
+import sys
+import threading
+
+# Бюджет памяти общего кэша таблиц по умолчанию, в байтах
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Ширина окна таблиц открытых ключей
+DEFAULT_TABLE_WIDTH = 4
+
+# Таблица строится при таком числе обращений к ключу без таблицы; None —
+# только явно (precompute): построение стоит нескольких проверок подписи, а
+# таблица P-256 занимает около 180 КБ, так что при многих ключах
+# автоматическое построение лишь замедляет проверку
+DEFAULT_BUILD_AFTER = None
+
+# Сколько ключей без таблицы отслеживается для счётчика обращений
+SEEN_KEYS_LIMIT = 4096
+
+CacheStatistics = collections.namedtuple(
+    'CacheStatistics',
+    ['hits', 'misses', 'evictions', 'builds', 'entries', 'bytes', 'max_bytes']
+)
+
+
+def table_nbytes(table) -> int:
+    """ Приблизительный объём таблицы build_fixed_base_table в байтах. """
+    _, rows = table
+    total = sys.getsizeof(rows)
+    for row in rows:
+        total += sys.getsizeof(row)
+        for entry in row:
+            if entry is not None:
+                total += sys.getsizeof(entry) + \
+                    sys.getsizeof(entry[0]) + sys.getsizeof(entry[1])
+    return total
+
+
+class PrecomputationCache:
+    """ Общий для процесса LRU-кэш таблиц фиксированного окна для точек
+        открытых ключей, ограниченный бюджетом памяти max_bytes (0 отключает
+        кэш). С таблицей умножение на точку ключа стоит как умножение на
+        генератор. Таблицы строятся по precompute для горячих ключей, а при
+        заданном build_after — и на build_after-м промахе по ключу.
+        Таблица приводит скаляр по модулю n, поэтому при кофакторе больше 1
+        она строится только для точек, для которых проверено n * P = O.
+        Потокобезопасен; таблица строится вне блокировки.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES,
+                 width: int = DEFAULT_TABLE_WIDTH,
+                 build_after: int = DEFAULT_BUILD_AFTER):
+        assert (max_bytes >= 0)
+        assert (width > 0)
+        assert ((build_after is None) or (build_after >= 1))
+        self._max_bytes = max_bytes
+        self._width = width
+        self._build_after = build_after
+        self._lock = threading.Lock()
+        # ключ -> (кривая, таблица, объём); кривая удерживает свой id
+        self._tables = collections.OrderedDict()
+        # ключ -> число обращений без таблицы
+        self._seen = collections.OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._builds = 0
+
+    @staticmethod
+    def _key(point):
+        return id(point.curve), int(point.x), int(point.y)
+
+    @staticmethod
+    def _in_subgroup(point) -> bool:
+        """ True, если n * point = O. При кофакторе 1 это верно для любой
+            точки кривой; иначе проверяется умножением без приведения
+            скаляра по модулю n.
+        """
+        curve = point.curve
+        if curve.cofactor == 1:
+            return True
+        return curve.jacobian_double_and_add(point, curve.order)[2] == 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        assert (max_bytes >= 0)
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def build_after(self):
+        return self._build_after
+
+    @build_after.setter
+    def build_after(self, build_after: int):
+        assert ((build_after is None) or (build_after >= 1))
+        with self._lock:
+            self._build_after = build_after
+            self._seen.clear()
+
+    @property
+    def statistics(self):
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                builds=self._builds,
+                entries=len(self._tables),
+                bytes=self._bytes,
+                max_bytes=self._max_bytes
+            )
+
+    def reset_statistics(self):
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._builds = 0
+
+    def table(self, point):
+        """ Таблица для точки point либо None. Если задан build_after,
+            промах увеличивает счётчик обращений к точке и на build_after-м
+            промахе таблица строится.
+        """
+        if point.is_neutral or point.curve.order is None:
+            return None
+        key = self._key(point)
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None:
+                self._tables.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            if self._max_bytes == 0 or self._build_after is None:
+                # кэш отключён либо таблицы строятся только явно
+                return None
+            seen = self._seen.pop(key, 0) + 1
+            if seen < self._build_after:
+                self._seen[key] = seen
+                if len(self._seen) > SEEN_KEYS_LIMIT:
+                    self._seen.popitem(last=False)
+                return None
+        return self._build(key, point)
+
+    def precompute(self, point):
+        """ Строит (если её ещё нет) и возвращает таблицу для точки.
+            None, если точка не лежит в подгруппе порядка n: для неё
+            таблица дала бы другой результат, чем обычное умножение.
+        """
+        if point.is_neutral or point.curve.order is None:
+            return None
+        key = self._key(point)
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None:
+                self._tables.move_to_end(key)
+                return entry[1]
+        return self._build(key, point)
+
+    def discard(self, point):
+        """ Удаляет таблицу точки из кэша, если она там есть. """
+        key = self._key(point)
+        with self._lock:
+            self._seen.pop(key, None)
+            entry = self._tables.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._seen.clear()
+            self._bytes = 0
+
+    def __contains__(self, point):
+        with self._lock:
+            return self._key(point) in self._tables
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tables)
+
+    def _build(self, key, point):
+        curve = point.curve
+        if not self._in_subgroup(point):
+            with self._lock:
+                self._seen.pop(key, None)
+            return None
+        table = curve.build_fixed_base_table(point, self._width)
+        nbytes = table_nbytes(table)
+        with self._lock:
+            self._builds += 1
+            self._seen.pop(key, None)
+            if key not in self._tables and nbytes <= self._max_bytes:
+                self._tables[key] = (curve, table, nbytes)
+                self._bytes += nbytes
+                self._evict()
+        return table
+
+    def _evict(self):
+        """ Вытесняет давно не использованные таблицы сверх бюджета. """
+        while self._bytes > self._max_bytes:
+            _, (_, _, nbytes) = self._tables.popitem(last=False)
+            self._bytes -= nbytes
+            self._evictions += 1
+
+
+_default_cache = PrecomputationCache()
+
+
+def default_cache():
+    """ Общий кэш, которым пользуются открытые ключи. """
+    return _default_cache
@@ -1,6 +1,6 @@
 from ECCBackend.keys.private_key_operations import ECDSASign, ECIESDecrypt, ECDH
 from ECCBackend.keys.public_key import ECPublicKey
-from ECCBackend.secure_random import rand_int_between
+from ECCBackend.secure_random import rand_int_between, rand_ints
 
 
 class ECPrivateKey(ECDSASign, ECIESDecrypt, ECDH):
@@ -8,6 +8,8 @@ class ECPrivateKey(ECDSASign, ECIESDecrypt, ECDH):
         self._scalar = scalar
         self._curve = curve
         self._pubkey = ECPublicKey(self._scalar * self._curve.gen)
+        self._nonce_pool = None
+        self._recoding = None
 
     @property
     def scalar(self):
@@ -22,11 +24,51 @@ class ECPrivateKey(ECDSASign, ECIESDecrypt, ECDH):
     def pubkey(self):
         return self._pubkey
 
+    @property
+    def nonce_pool(self):
+        """ Пул эфемерных скаляров для подписи: собственный пул ключа
+            либо, если его нет, пул кривой.
+        """
+        if self._nonce_pool is not None:
+            return self._nonce_pool
+        return self._curve.nonce_pool
+
+    @nonce_pool.setter
+    def nonce_pool(self, pool):
+        assert ((pool is None) or (pool.curve is self._curve))
+        self._nonce_pool = pool
+
     @staticmethod
     def generate(curve):
         scalar = rand_int_between(1, curve.order - 1)
         return ECPrivateKey(scalar, curve)
 
+    @staticmethod
+    def generate_many(curve, count: int) -> list:
+        """ count случайных закрытых ключей с одним чтением случайных байт.
+        """
+        return [
+            ECPrivateKey(scalar + 1, curve)
+            for scalar in rand_ints(curve.order - 1, count)
+        ]
+
+    def encode(self) -> bytes:
+        """ Закрытый ключ по SEC1: скаляр big-endian длиной в байтах
+            порядка кривой.
+        """
+        length = (self._curve.order.bit_length() + 7) // 8
+        return self._scalar.to_bytes(length, byteorder='big')
+
+    @staticmethod
+    def decode(data: bytes, curve):
+        """ Закрытый ключ из кодировки SEC1 на кривой curve. """
+        if len(data) != (curve.order.bit_length() + 7) // 8:
+            raise ValueError('Invalid private key length.')
+        scalar = int.from_bytes(data, byteorder='big')
+        if not (0 < scalar < curve.order):
+            raise ValueError('Private key is out of range.')
+        return ECPrivateKey(scalar, curve)
+
     def __str__(self):
         return '0x%x' % self.scalar
 
@@ -1,49 +1,66 @@
 import collections
-import hashlib
 
 import ECCBackend.tools as tools
-from ECCBackend.curves.field_element import FieldElement
-from ECCBackend.secure_random import rand_int_between
+from ECCBackend.keys.ephemeral_pool import draw_ephemeral
 
 
 class ECDSASign:
+    # recovery_id позволяет восстановить точку R = k * G по r: бит 0 —
+    # чётность y, бит 1 — признак того, что x(R) = r + n. Подписи без него
+    # (recovery_id = None) проверяются пакетно только поштучно.
     ECDSASignature = collections.namedtuple(
-        'ECDSASignature', ['hashalg', 'r', 's']
+        'ECDSASignature', ['hashalg', 'r', 's', 'recovery_id'],
+        defaults=(None,)
     )
 
     def ecdsa_sign_hash(self, message_digest: bytes,
                         digest_name: str = None, nonce: int = None):
         """ Подписывает дайджест сообщения message_digest, используя ECDSA.
             Также есть возможность ввести nonce, чтобы избежать эксплойт.
-            Если nonce не введено, то оно выбирается случайно. Если
+            Если nonce не введено, то оно берётся из пула эфемерных
+            скаляров (nonce_pool) либо выбирается случайно. Если
             введено digest_name, то оно дописывается в конец объекта подписи.
+            В подпись записывается recovery_id точки R для пакетной проверки.
         """
         # Дайджест сообщения -> целочисленное значение
-        e = tools.ecdsa_msg_digest_to_int(message_digest, self.curve.order)
+        order = self.curve.order
+        e = tools.ecdsa_msg_digest_to_int(message_digest, order)
 
         if nonce is None:
-            nonce = rand_int_between(1, self.curve.order - 1)
+            # k, k^-1 и k * G не зависят от сообщения: берутся из пула
+            nonce, nonce_inv, r_mod_p = draw_ephemeral(
+                self.curve, self.nonce_pool
+            )
+        else:
+            nonce_inv = pow(nonce, -1, order)
+            r_mod_p = nonce * self.curve.gen
 
         # r = (k * G)_x mod n
-        r_mod_p = nonce * self.curve.gen
-        r = int(r_mod_p.x) % self.curve.order
+        r = int(r_mod_p.x) % order
         assert (r != 0)
+        recovery_id = (int(r_mod_p.y) & 1) | \
+            (2 if int(r_mod_p.x) >= order else 0)
 
-        s = FieldElement(e + self.scalar * r, self.curve.order) // nonce
+        s = (e + self.scalar * r) * nonce_inv % order
 
-        return self.ECDSASignature(r=r, s=int(s), hashalg=digest_name)
+        return self.ECDSASignature(
+            r=r, s=s, hashalg=digest_name, recovery_id=recovery_id
+        )
 
-    def ecdsa_sign(self, message: bytes, digest_name: str, nonce=None):
-        """ Подписывает сообщение message, используя ECDSA. Также есть
-            возможность ввести nonce, чтобы избежать эксплойта. Если nonce не
-            введено, то оно выбирается случайно. Если введено digest_name, то
-            оно дописывается в конец объекта подписи.
+    def ecdsa_sign(self, message, digest_name: str, nonce=None):
+        """ Подписывает сообщение message, используя ECDSA. Сообщение —
+            байты, путь к файлу os.PathLike (не str), файловый объект или
+            итерируемый набор порций (см. tools.message_digest); для str
+            бросается TypeError. Сообщение хэшируется по порциям до
+            обращения к кривой. Также есть возможность ввести nonce, чтобы
+            избежать эксплойта. Если nonce не введено, то оно берётся из
+            пула эфемерных скаляров (nonce_pool ключа либо кривой), а без
+            пула выбирается случайно. Если введено digest_name, то оно
+            дописывается в конец объекта подписи.
         """
-        digest_func = hashlib.new(digest_name)
-        digest_func.update(message)
-        message_digest = digest_func.digest()
         return self.ecdsa_sign_hash(
-            message_digest, digest_name=digest_name, nonce=nonce
+            tools.message_digest(digest_name, message),
+            digest_name=digest_name, nonce=nonce
         )
 
 
@@ -52,8 +69,75 @@ class ECIESDecrypt(object):
         # R передан, восстанавливаем симметричный ключ S
         return self._scalar * r
 
+    def ecies_decrypt_x(self, r):
+        """ Восстанавливает только x-координату S. R можно передать точкой
+            либо её x-координатой; во втором случае используется лестница
+            Монтгомери.
+        """
+        if isinstance(r, int):
+            return self.curve.x_only_multiply(r, self._scalar)
+        shared = self.curve.jacobian_to_affine(
+            self.curve.jacobian_multiply(r, self._scalar)
+        )
+        return None if shared is None else shared[0]
+
 
 class ECDH(object):
+    @property
+    def scalar_recoding(self):
+        """ Представление закрытого скаляра для умножения (см.
+            recode_scalar), вычисляемое один раз на ключ.
+        """
+        if self._recoding is None:
+            self._recoding = self.curve.recode_scalar(self.scalar)
+        return self._recoding
+
     def ecdh_compute(self, peer_pubkey):
-        return self.scalar * peer_pubkey.point
+        return self.ecdh_compute_many([peer_pubkey])[0]
 
+    def ecdh_compute_many(self, peers, x_only: bool = False) -> list:
+        """ ECDH с открытыми ключами peers одним закрытым скаляром. Его
+            представление берётся из scalar_recoding, таблицы нечётных
+            кратных всех точек собеседников и все результаты приводятся к
+            аффинным координатам одним обращением каждые. Возвращает список
+            общих точек либо, при x_only, их x-координат (None для
+            нейтрального элемента).
+        """
+        curve = self.curve
+        recoding = self.scalar_recoding
+        tables = curve.odd_multiples_batch(
+            [peer.point for peer in peers], recoding[0]
+        )
+        shared = curve.jacobian_to_affine_batch([
+            curve.jacobian_multiply_recoded(recoding, multiples)
+            for multiples in tables
+        ])
+        if x_only:
+            return [None if xy is None else xy[0] for xy in shared]
+        return [
+            curve.neutral() if xy is None else curve.point(*xy)
+            for xy in shared
+        ]
+
+    def ecdh_compute_x(self, peer_pubkey, recover_y: bool = False):
+        """ ECDH, возвращающий только x-координату общей точки (None для
+            нейтрального элемента). peer_pubkey — открытый ключ либо только
+            x-координата его точки. По одной x-координате общая точка
+            вычисляется лестницей Монтгомери без восстановления y точки
+            собеседника. При recover_y лестница применяется к открытому
+            ключу и возвращается вся общая точка с y, восстановленной
+            формулой Окейи — Сакураи. Для открытого ключа без recover_y
+            используются якобиевы координаты с width-NAF: на кривых
+            Вейерштрасса они быстрее лестницы.
+        """
+        if isinstance(peer_pubkey, int):
+            assert (not recover_y)
+            return self.curve.x_only_multiply(peer_pubkey, self.scalar)
+        if recover_y:
+            return self.curve.x_only_multiply_point(
+                peer_pubkey.point, self.scalar
+            )
+        shared = self.curve.jacobian_to_affine(
+            self.curve.jacobian_multiply(peer_pubkey.point, self.scalar)
+        )
+        return None if shared is None else shared[0]
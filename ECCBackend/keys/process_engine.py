@@ -0,0 +1,229 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+
+import ECCBackend.tools as tools
+from ECCBackend.curves.weierstrass_curve import WeierstrassCurve
+from ECCBackend.keys.precomputation_cache import default_cache
+from ECCBackend.keys.private_key import ECPrivateKey
+from ECCBackend.keys.private_key_operations import ECDSASign
+from ECCBackend.keys.public_key import ECPublicKey
+from ECCBackend.keys.public_key_operations import ecdsa_verify_hash_batch
+
+# Число заданий в одной порции, отправляемой процессу
+DEFAULT_CHUNK_SIZE = 64
+
+# Сколько порций на процесс может одновременно ожидать результата
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Параметры кривой в виде целых чисел: процессы строят кривые сами,
+# а не получают граф объектов WeierstrassCurve / Point
+_CurveSpec = collections.namedtuple(
+    '_CurveSpec',
+    ['a', 'b', 'modulus', 'order', 'cofactor', 'gen_x', 'gen_y', 'name',
+     'gen_table_width']
+)
+
+# Кривые процесса-исполнителя в порядке регистрации в движке
+_worker_curves = []
+
+
+def _curve_spec(curve):
+    assert (isinstance(curve, WeierstrassCurve))
+    assert (curve.has_generator and curve.order is not None)
+    return _CurveSpec(
+        a=int(curve.a), b=int(curve.b), modulus=curve.modulus,
+        order=curve.order, cofactor=curve.cofactor,
+        gen_x=int(curve.gen.x), gen_y=int(curve.gen.y), name=curve.name,
+        gen_table_width=curve.gen_table_width
+    )
+
+
+def _worker_init(specs, key_points):
+    """ Строит кривые, их таблицы генератора и таблицы горячих ключей
+        один раз при запуске процесса.
+    """
+    del _worker_curves[:]
+    for spec in specs:
+        curve = WeierstrassCurve(
+            spec.a, spec.b, spec.modulus, spec.order, spec.cofactor,
+            spec.gen_x, spec.gen_y, name=spec.name,
+            gen_table_width=spec.gen_table_width
+        )
+        if curve.gen_table_width > 0:
+            # таблица генератора строится сразу, а не в первом задании
+            curve.gen_table
+        _worker_curves.append(curve)
+    for curve_id, x, y in key_points:
+        default_cache().precompute(_worker_curves[curve_id].point(x, y))
+
+
+def _sign_chunk(curve_id, scalar, digest_name, digests):
+    key = ECPrivateKey(scalar, _worker_curves[curve_id])
+    return [
+        tuple(key.ecdsa_sign_hash(digest, digest_name=digest_name))
+        for digest in digests
+    ]
+
+
+def _verify_chunk(curve_id, entries):
+    curve = _worker_curves[curve_id]
+    pubkeys = {}
+    items = []
+    for x, y, digest, signature in entries:
+        pubkey = pubkeys.get((x, y))
+        if pubkey is None:
+            pubkey = pubkeys[(x, y)] = ECPublicKey(curve.point(x, y))
+        items.append(
+            (pubkey, digest, ECDSASign.ECDSASignature(*signature))
+        )
+    return ecdsa_verify_hash_batch(items)
+
+
+def _ecdh_chunk(curve_id, scalar, peers):
+    curve = _worker_curves[curve_id]
+    results = []
+    for x, y in peers:
+        shared = curve.jacobian_to_affine(
+            curve.jacobian_multiply(curve.point(x, y), scalar)
+        )
+        results.append(shared)
+    return results
+
+
+class ProcessEngine:
+    """ Распределяет подпись, проверку и ECDH по процессам
+        ProcessPoolExecutor. Кривые передаются процессам один раз при
+        запуске в виде целых чисел; там же строятся таблицы генераторов и
+        таблицы ключей из precompute_keys. Задания отправляются порциями по
+        chunk_size, не более CHUNKS_IN_FLIGHT_PER_WORKER порций на процесс
+        одновременно, а результаты выдаются по мере готовности в исходном
+        порядке. Сообщения хэшируются в вызывающем процессе: исполнителям
+        передаются только дайджесты и целые числа.
+    """
+    def __init__(self, curves, max_workers: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 precompute_keys=(), mp_context=None):
+        assert (chunk_size > 0)
+        self._curves = list(curves)
+        self._curve_ids = {
+            id(curve): curve_id for curve_id, curve in enumerate(self._curves)
+        }
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers or os.cpu_count() or 1
+        key_points = [
+            (self._curve_id(pubkey.curve),
+             int(pubkey.point.x), int(pubkey.point.y))
+            for pubkey in precompute_keys
+        ]
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self._max_workers, mp_context=mp_context,
+            initializer=_worker_init,
+            initargs=([_curve_spec(c) for c in self._curves], key_points)
+        )
+
+    def _curve_id(self, curve):
+        curve_id = self._curve_ids.get(id(curve))
+        if curve_id is None:
+            raise ValueError(
+                'Curve %s is not registered in the engine' % curve
+            )
+        return curve_id
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    def _chunks(self, iterable):
+        iterator = iter(iterable)
+        while True:
+            chunk = list(itertools.islice(iterator, self._chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _stream(self, calls):
+        """ Отправляет вызовы (fn, args) с ограничением числа ожидающих
+            порций и выдаёт элементы результатов в исходном порядке.
+        """
+        limit = self._max_workers * CHUNKS_IN_FLIGHT_PER_WORKER
+        pending = collections.deque()
+        for fn, args in calls:
+            pending.append(self._executor.submit(fn, *args))
+            if len(pending) >= limit:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def sign_many(self, private_key, messages, digest_name: str):
+        """ Подписи ECDSA для сообщений messages (в любом виде,
+            принимаемом tools.message_digest) в исходном порядке.
+        """
+        curve_id = self._curve_id(private_key.curve)
+        calls = (
+            (_sign_chunk, (curve_id, private_key.scalar, digest_name, [
+                tools.message_digest(digest_name, message)
+                for message in chunk
+            ]))
+            for chunk in self._chunks(messages)
+        )
+        for signature in self._stream(calls):
+            yield ECDSASign.ECDSASignature(*signature)
+
+    def verify_many(self, items):
+        """ Результаты проверки троек (pubkey, message, signature) в
+            исходном порядке. Порция проверяется пакетно (см.
+            ecdsa_verify_hash_batch); тройки разных кривых идут в разных
+            порциях.
+        """
+        def calls():
+            for chunk in self._chunks(items):
+                for curve_id, entries in self._verify_groups(chunk):
+                    yield _verify_chunk, (curve_id, entries)
+
+        yield from self._stream(calls())
+
+    def _verify_groups(self, chunk):
+        """ Делит порцию на непрерывные группы троек одной кривой. """
+        groups = []
+        for pubkey, message, signature in chunk:
+            curve_id = self._curve_id(pubkey.curve)
+            entry = (
+                int(pubkey.point.x), int(pubkey.point.y),
+                tools.message_digest(signature.hashalg, message),
+                tuple(signature)
+            )
+            if groups and groups[-1][0] == curve_id:
+                groups[-1][1].append(entry)
+            else:
+                groups.append((curve_id, [entry]))
+        return groups
+
+    def ecdh_many(self, private_key, peer_pubkeys):
+        """ Общие точки ECDH с открытыми ключами peer_pubkeys в исходном
+            порядке.
+        """
+        curve = private_key.curve
+        curve_id = self._curve_id(curve)
+        calls = (
+            (_ecdh_chunk, (curve_id, private_key.scalar, [
+                (int(peer.point.x), int(peer.point.y)) for peer in chunk
+            ]))
+            for chunk in self._chunks(peer_pubkeys)
+        )
+        for shared in self._stream(calls):
+            yield curve.neutral() if shared is None else curve.point(*shared)
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
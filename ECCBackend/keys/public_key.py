@@ -1,3 +1,4 @@
+from ECCBackend.keys.precomputation_cache import default_cache
 from ECCBackend.keys.public_key_operations import ECDSAVerify, \
     ECDSAExploitReusedNonce, ECIESEncrypt
 
@@ -14,5 +15,34 @@ class ECPublicKey(ECDSAVerify, ECDSAExploitReusedNonce, ECIESEncrypt):
     def point(self):
         return self._point
 
+    def precompute(self):
+        """ Строит таблицу предвычислений для точки ключа в общем кэше:
+            для часто используемых ключей проверка и шифрование затем идут
+            по таблице. Без вызова таблица не строится (если у кэша не
+            задан build_after).
+        """
+        return default_cache().precompute(self._point)
+
+    def jacobian_point_multiply(self, scalar: int):
+        """ scalar * Q в якобиевых координатах: по таблице из общего кэша,
+            если она есть, иначе обычным умножением.
+        """
+        table = default_cache().table(self._point)
+        if table is None:
+            return self.curve.jacobian_multiply(self._point, scalar)
+        return self.curve.jacobian_table_multiply(table, scalar)
+
+    def encode(self, compressed: bool = True) -> bytes:
+        """ Открытый ключ в кодировке SEC1, по умолчанию сжатой. """
+        return self._point.encode(compressed)
+
+    @staticmethod
+    def decode(data: bytes, curve):
+        """ Открытый ключ из кодировки SEC1 на кривой curve. """
+        point = curve.decode_point(data)
+        if point.is_neutral:
+            raise ValueError('Public key is the neutral element.')
+        return ECPublicKey(point)
+
     def __str__(self):
         return str(self.point)
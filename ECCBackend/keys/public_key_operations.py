@@ -1,26 +1,26 @@
-import hashlib
+import collections
 
 import ECCBackend.tools as tools
 from ECCBackend.curves.field_element import FieldElement
+from ECCBackend.keys.ephemeral_pool import draw_ephemeral
+from ECCBackend.keys.precomputation_cache import default_cache
 from ECCBackend.secure_random import rand_int_between
 
 
 class ECDSAExploitReusedNonce:
-    def ecdsa_exploit_reused_nonce(self, msg1: bytes, sig1, msg2: bytes, sig2):
+    def ecdsa_exploit_reused_nonce(self, msg1, sig1, msg2, sig2):
         """ Даны два разных сообщения msg1 и msg2 и соответствующие им
             подписи sig1, sig2, попытаться вычислить приватный ключ,
             использованный для подписи, если при подписи не были использованы
-            уникальные nonce.
+            уникальные nonce. Сообщения принимаются в тех же видах, что и
+            в ecdsa_verify: байты, путь os.PathLike (не str), файловый
+            объект или набор порций; для str бросается TypeError.
         """
-        assert (msg1 != msg2)
         assert (sig1.r == sig2.r)
 
-        dig1 = hashlib.new(sig1.hashalg)
-        dig1.update(msg1)
-        dig1 = dig1.digest()
-        dig2 = hashlib.new(sig2.hashalg)
-        dig2.update(msg2)
-        dig2 = dig2.digest()
+        dig1 = tools.message_digest(sig1.hashalg, msg1)
+        dig2 = tools.message_digest(sig2.hashalg, msg2)
+        assert (dig1 != dig2)
 
         e1 = tools.ecdsa_msg_digest_to_int(dig1, self.point.curve.order)
         e2 = tools.ecdsa_msg_digest_to_int(dig2, self.point.curve.order)
@@ -54,15 +54,46 @@ class ECDSAVerify:
         u1 = int(e * w)
         u2 = int(r * w)
 
-        point = (u1 * self.curve.gen) + (u2 * self.point)
+        curve = self.curve
+        table = default_cache().table(self.point)
+        if table is None:
+            # u1 * G + u2 * Q с общей цепочкой удвоений
+            point = curve.multi_scalar_mul([(u1, curve.gen), (u2, self.point)])
+        else:
+            # обе точки фиксированы: u1 * G и u2 * Q по таблицам
+            point = curve.from_jacobian(curve.jacobian_add(
+                curve.jacobian_multiply(curve.gen, u1),
+                curve.jacobian_table_multiply(table, u2)
+            ))
+        if point.is_neutral:
+            return False
         x1 = int(point.x) % self.curve.order
         return x1 == r
 
-    def ecdsa_verify(self, message: bytes, signature):
-        digest_fnc = hashlib.new(signature.hashalg)
-        digest_fnc.update(message)
-        message_digest = digest_fnc.digest()
-        return self.ecdsa_verify_hash(message_digest, signature)
+    def ecdsa_verify(self, message, signature):
+        """ Проверяет подпись сообщения message: байтов, пути к файлу
+            os.PathLike (не str), файлового объекта или итерируемого набора
+            порций (см. tools.message_digest); для str бросается TypeError.
+        """
+        return self.ecdsa_verify_hash(
+            tools.message_digest(signature.hashalg, message), signature
+        )
+
+    def ecdsa_verify_hash_batch(self, items) -> list:
+        """ Пакетная проверка пар (message_digest, signature) для данного
+            ключа. Возвращает список результатов в порядке items.
+        """
+        return ecdsa_verify_hash_batch(
+            [(self, digest, signature) for digest, signature in items]
+        )
+
+    def ecdsa_verify_batch(self, items) -> list:
+        """ Пакетная проверка пар (message, signature) для данного ключа.
+            Возвращает список результатов в порядке items.
+        """
+        return ecdsa_verify_batch(
+            [(self, message, signature) for message, signature in items]
+        )
 
 
 class ECIESEncrypt:
@@ -73,9 +104,130 @@ class ECIESEncrypt:
             точка, которая передается вместе с сообщением, S — это точка,
             "похожая" на общий секрет. Получатель может использовать R вместе со
             своим закрытым ключом для восстановления S. В качестве входных может
-            быть также введен nonce r. Если он не введен, то r выбирается
-            случайным образом.
+            быть также введен nonce r. Если он не введен, то r и R берутся
+            из пула эфемерных скаляров кривой либо выбираются случайно.
         """
         if r is None:
-            r = rand_int_between(1, self.curve.order - 1)
-        return {'R': r * self.curve.gen, 'S': r * self.point}
+            r, _, big_r = draw_ephemeral(self.curve)
+        else:
+            big_r = r * self.curve.gen
+        return {
+            'R': big_r,
+            'S': self.curve.from_jacobian(self.jacobian_point_multiply(r))
+        }
+
+
+# Размер части пакета, которая проверяется поштучно, а не делится пополам
+BATCH_VERIFY_SPLIT_MIN = 4
+
+# Разрядность случайных коэффициентов линейной комбинации
+BATCH_VERIFY_COEFFICIENT_BITS = 128
+
+_BatchEntry = collections.namedtuple(
+    '_BatchEntry', ['index', 'pubkey', 'digest', 'signature', 'u1', 'u2', 'R']
+)
+
+
+def ecdsa_signature_point(curve, signature):
+    """ Восстанавливает точку R = k * G подписи по r и recovery_id.
+        Возвращает None, если recovery_id не задан или точки не существует.
+    """
+    if signature.recovery_id is None:
+        return None
+    x = signature.r
+    if signature.recovery_id & 2:
+        x += curve.order
+    if x >= curve.modulus:
+        return None
+    points = curve.get_point_with_x(x)
+    if points is None:
+        return None
+    return points[signature.recovery_id & 1]
+
+
+def ecdsa_verify_batch(items) -> list:
+    """ Пакетная проверка троек (pubkey, message, signature); ключи и
+        кривые могут различаться. Возвращает список результатов в порядке
+        items.
+    """
+    return ecdsa_verify_hash_batch([
+        (pubkey, tools.message_digest(signature.hashalg, message), signature)
+        for pubkey, message, signature in items
+    ])
+
+
+def ecdsa_verify_hash_batch(items) -> list:
+    """ Пакетная проверка троек (pubkey, message_digest, signature).
+        Подписи, по которым восстанавливается R, проверяются для каждой
+        кривой одним уравнением
+            sum z_i * (u1_i * G + u2_i * Q_i - R_i) = O
+        со случайными z_i, вычисляемым одним мультискалярным умножением.
+        Если уравнение не выполняется, пакет делится пополам, пока
+        неверные подписи не будут найдены поштучной проверкой. Остальные
+        подписи (без recovery_id, на кривых с кофактором больше 1)
+        проверяются поштучно. Результаты совпадают с ecdsa_verify_hash,
+        но подпись вне допустимого диапазона даёт False, а не исключение.
+    """
+    results = [False] * len(items)
+    batches = {}
+    for index, (pubkey, digest, signature) in enumerate(items):
+        curve = pubkey.curve
+        order = curve.order
+        if not (0 < signature.r < order and 0 < signature.s < order):
+            continue
+        big_r = None
+        if curve.cofactor == 1:
+            big_r = ecdsa_signature_point(curve, signature)
+        if big_r is None:
+            results[index] = pubkey.ecdsa_verify_hash(digest, signature)
+            continue
+        e = tools.ecdsa_msg_digest_to_int(digest, order)
+        w = pow(signature.s, -1, order)
+        entry = _BatchEntry(
+            index, pubkey, digest, signature,
+            e * w % order, signature.r * w % order, big_r
+        )
+        batches.setdefault(id(curve), (curve, []))[1].append(entry)
+
+    for curve, entries in batches.values():
+        _ecdsa_verify_split(curve, entries, results)
+    return results
+
+
+def _ecdsa_verify_split(curve, entries, results):
+    """ Проверяет entries одним уравнением, при неудаче — по половинам. """
+    if len(entries) <= BATCH_VERIFY_SPLIT_MIN:
+        for entry in entries:
+            results[entry.index] = entry.pubkey.ecdsa_verify_hash(
+                entry.digest, entry.signature
+            )
+        return
+    if _ecdsa_batch_equation(curve, entries):
+        for entry in entries:
+            results[entry.index] = True
+        return
+    half = len(entries) // 2
+    _ecdsa_verify_split(curve, entries[:half], results)
+    _ecdsa_verify_split(curve, entries[half:], results)
+
+
+def _ecdsa_batch_equation(curve, entries) -> bool:
+    """ True, если sum z_i * (u1_i * G + u2_i * Q_i - R_i) = O для
+        случайных z_i. Слагаемые с G и с одинаковыми ключами суммируются
+        в один скаляр.
+    """
+    order = curve.order
+    gen_scalar = 0
+    key_scalars = {}
+    terms = []
+    for entry in entries:
+        z = rand_int_between(1, (1 << BATCH_VERIFY_COEFFICIENT_BITS) - 1)
+        gen_scalar += z * entry.u1
+        key = entry.pubkey.point
+        key_scalars[key] = key_scalars.get(key, 0) + z * entry.u2
+        terms.append((z, -entry.R))
+    terms.append((gen_scalar % order, curve.gen))
+    terms.extend(
+        (scalar % order, point) for point, scalar in key_scalars.items()
+    )
+    return curve.multi_scalar_mul(terms).is_neutral
@@ -1,6 +1,10 @@
+import math
 import random
 import secrets
 
+# Граница пробного деления перед ро-методом Полларда
+TRIAL_DIVISION_BOUND = 1 << 12
+
 
 def random_prime(bits: int, tests: int = None) -> int:
     if bits < 8:
@@ -63,3 +67,86 @@ def miller_rabin(integer: int, security: int) -> bool:
             if y != integer - 1:
                 return False
     return True
+
+
+def jacobi_symbol(a: int, n: int) -> int:
+    """ Символ Якоби (a / n) для нечётного n > 0 двоичным алгоритмом:
+        степени двойки отбрасываются сдвигом, знак меняется по n mod 8 и
+        квадратичному закону взаимности, а вместо вычитаний берётся остаток
+        от деления — в CPython так быстрее. Для простого n совпадает с
+        символом Лежандра и на порядок дешевле критерия Эйлера.
+    """
+    assert (n > 0 and n & 1)
+    a %= n
+    result = 1
+    while a:
+        zeros = (a & -a).bit_length() - 1
+        a >>= zeros
+        if zeros & 1 and (n & 7) in (3, 5):
+            result = -result
+        if a & n & 2:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+
+def pollard_rho(n: int) -> int:
+    """ Нетривиальный делитель составного n ро-методом Полларда в варианте
+        Брента: x -> x^2 + c, НОД накапливаемого произведения разностей
+        вычисляется раз в 128 шагов. Ожидаемое время — O(sqrt(q)) для
+        наименьшего простого делителя q.
+    """
+    if n % 2 == 0:
+        return 2
+    batch = 128
+    while True:
+        y, c = random.randrange(1, n), random.randrange(1, n)
+        g = r = q = 1
+        x = saved = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                saved = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            r <<= 1
+        if g == n:
+            # произведение обнулилось: повтор последней порции по шагу
+            while True:
+                saved = (saved * saved + c) % n
+                g = math.gcd(abs(x - saved), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+
+
+def factorize(n: int) -> dict:
+    """ Разложение n > 0 на простые множители в виде словаря
+        {простое: степень} по возрастанию: пробное деление до
+        TRIAL_DIVISION_BOUND, затем ро-метод Полларда для составных
+        остатков (простота проверяется тестом Миллера — Рабина).
+    """
+    assert (n > 0)
+    factors = {}
+    for divisor in range(2, TRIAL_DIVISION_BOUND):
+        if divisor * divisor > n:
+            break
+        while n % divisor == 0:
+            factors[divisor] = factors.get(divisor, 0) + 1
+            n //= divisor
+    pending = [n] if n > 1 else []
+    while pending:
+        m = pending.pop()
+        if m < TRIAL_DIVISION_BOUND ** 2 or is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            divisor = pollard_rho(m)
+            pending.extend((divisor, m // divisor))
+    return dict(sorted(factors.items()))
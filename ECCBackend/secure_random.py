@@ -1,26 +1,89 @@
+import os
+import threading
+
+# Сколько байт читается из os.urandom за одно пополнение буфера
+RANDOM_BUFFER_SIZE = 4096
+
+
+class BufferedRandom:
+    """ Источник случайных байт с буфером, который пополняется одним
+        вызовом os.urandom (getrandom) вместо открытия /dev/urandom на
+        каждый запрос. Потокобезопасен; после fork дочерний процесс
+        отбрасывает унаследованный буфер, чтобы не повторить байты родителя.
+    """
+    def __init__(self, buffer_size: int = RANDOM_BUFFER_SIZE):
+        assert (buffer_size > 0)
+        self._buffer_size = buffer_size
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buffer = b''
+        self._offset = 0
+
+    def read(self, length: int) -> bytes:
+        """ length случайных байт; каждый байт буфера выдаётся один раз. """
+        if length > self._buffer_size:
+            return os.urandom(length)
+        with self._lock:
+            end = self._offset + length
+            if end > len(self._buffer):
+                self._buffer = os.urandom(self._buffer_size)
+                self._offset, end = 0, length
+            data = self._buffer[self._offset:end]
+            self._offset = end
+        return data
+
+
+_source = BufferedRandom()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_source._reset)
+
+
 def rand(length):
-    f = open('/dev/urandom', 'rb')
-    data = f.read(length)
+    data = _source.read(length)
     assert (len(data) == length)
-    f.close()
     return data
 
 
-def rand_int(max_value: int) -> int:
+def _rand_int_params(max_value: int):
+    """ Число байт на кандидата и граница отбраковки для rand_int. """
     assert (max_value >= 2)
     bytecnt = ((max_value - 1).bit_length() + 7) // 8
     max_bin_value = 256 ** bytecnt
     wholecnt = max_bin_value // max_value
     cutoff = wholecnt * max_value
+    return bytecnt, cutoff
+
+
+def rand_int(max_value: int) -> int:
+    bytecnt, cutoff = _rand_int_params(max_value)
     while True:
-        rnd = sum(
-            (value << (8 * bytepos))
-            for bytepos, value in enumerate(rand(bytecnt))
-        )
+        rnd = int.from_bytes(rand(bytecnt), byteorder='little')
         if rnd < cutoff:
             break
     return rnd % max_value
 
 
+def rand_ints(max_value: int, count: int) -> list:
+    """ count независимых случайных чисел из [0, max_value) с той же
+        отбраковкой, что и rand_int, но с одним чтением случайных байт на
+        всех кандидатов.
+    """
+    bytecnt, cutoff = _rand_int_params(max_value)
+    values = []
+    while len(values) < count:
+        missing = count - len(values)
+        data = rand(missing * bytecnt)
+        for offset in range(0, len(data), bytecnt):
+            rnd = int.from_bytes(
+                data[offset:offset + bytecnt], byteorder='little'
+            )
+            if rnd < cutoff:
+                values.append(rnd % max_value)
+    return values
+
+
 def rand_int_between(min_value: int, max_value: int) -> int:
     return rand_int(max_value - min_value + 1) + min_value
@@ -1,3 +1,16 @@
+import hashlib
+import mmap
+import os
+import stat
+
+# Размер порции при потоковом хэшировании, в байтах
+HASH_CHUNK_SIZE = 1 << 20
+
+# Размер окна отображения файла в память: файл отображается по частям,
+# чтобы резидентная память не росла с размером файла
+HASH_MMAP_WINDOW = 64 * HASH_CHUNK_SIZE
+
+
 def bytes_to_int_le(data):
     return sum(value << (8 * index) for (index, value) in enumerate(data))
 
@@ -26,3 +39,77 @@ def ecdsa_msg_digest_to_int(message_digest, curve_order):
         e >>= shift
 
     return e
+
+
+def message_digest(digest_name: str, message) -> bytes:
+    """ Дайджест сообщения алгоритмом digest_name. Сообщение может быть
+        байтами, путём к файлу в виде os.PathLike (например, pathlib.Path),
+        файловым объектом (читается с текущей позиции до конца) или
+        итерируемым набором порций байт. Строка str не считается путём:
+        для неё, как и раньше, бросается TypeError, чтобы строка извне не
+        открыла локальный файл. Файлы и
+        порции хэшируются по HASH_CHUNK_SIZE байт, так что расход памяти не
+        зависит от размера сообщения; обычные файлы отображаются в память
+        (mmap) окнами по HASH_MMAP_WINDOW байт.
+    """
+    digest_func = hashlib.new(digest_name)
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        digest_func.update(message)
+    elif isinstance(message, str):
+        raise TypeError(
+            'Strings must be encoded before hashing; '
+            'pass file paths as os.PathLike.'
+        )
+    elif isinstance(message, os.PathLike):
+        with open(message, 'rb') as f:
+            _hash_file(digest_func, f)
+    elif hasattr(message, 'readinto') or hasattr(message, 'read'):
+        _hash_file(digest_func, message)
+    else:
+        for chunk in message:
+            digest_func.update(chunk)
+    return digest_func.digest()
+
+
+def _hash_file(digest_func, f):
+    """ Хэширует файл с текущей позиции: обычный файл с начала — через
+        mmap, иначе — чтением в один переиспользуемый буфер.
+    """
+    try:
+        fd = f.fileno()
+        at_start = f.tell() == 0
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    if fd is not None and at_start:
+        info = os.fstat(fd)
+        if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+            size = info.st_size
+            for start in range(0, size, HASH_MMAP_WINDOW):
+                length = min(HASH_MMAP_WINDOW, size - start)
+                with mmap.mmap(fd, length, access=mmap.ACCESS_READ,
+                               offset=start) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, length, HASH_CHUNK_SIZE):
+                            digest_func.update(
+                                view[offset:offset + HASH_CHUNK_SIZE]
+                            )
+                    finally:
+                        view.release()
+            f.seek(0, os.SEEK_END)
+            return
+    if hasattr(f, 'readinto'):
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest_func.update(view[:count])
+        view.release()
+        return
+    while True:
+        chunk = f.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest_func.update(chunk)
@@ -0,0 +1,77 @@
+""" Эталонные реализации для перекрёстных проверок быстрых алгоритмов:
+    умножение сложением в аффинных координатах и подсчёт точек перебором,
+    а также небольшие кривые, на которых их можно выполнить.
+"""
+import random
+
+from ECCBackend.curves.weierstrass_curve import WeierstrassCurve
+
+# Тесты воспроизводимы: случайные скаляры берутся из этого генератора
+RANDOM = random.Random(20261018)
+
+
+def small_curve():
+    """ y^2 = x^3 + 7x + 13 над F_1000003 (p = 3 mod 4) простого порядка
+        999721 с кофактором 1.
+    """
+    return WeierstrassCurve(7, 13, 1000003, 999721, 1, 1, 501938)
+
+
+def small_glv_curve():
+    """ y^2 = x^3 + 13 над F_1000033 (p = 1 mod 3 и p = 1 mod 4) простого
+        порядка 998737 = 1 mod 3: на ней работает эндоморфизм GLV.
+    """
+    return WeierstrassCurve(0, 13, 1000033, 998737, 1, 5, 708400)
+
+
+def tiny_curve(a: int = 2, b: int = 3, p: int = 1009):
+    """ Кривая без параметров группы, достаточно малая для перебора. """
+    return WeierstrassCurve(a, b, p, None, None, None, None)
+
+
+def affine_multiply(point, scalar: int):
+    """ scalar * point методом "удвоение-сложение" справа налево только
+        через point_addition в аффинных координатах.
+    """
+    curve = point.curve
+    result = curve.neutral()
+    addend = point
+    while scalar > 0:
+        if scalar & 1:
+            result = curve.point_addition(result, addend)
+        addend = curve.point_addition(addend, addend)
+        scalar >>= 1
+    return result
+
+
+def affine_sum(terms):
+    """ Сумма k_1 * P_1 + ... + k_n * P_n через affine_multiply. """
+    terms = list(terms)
+    curve = terms[0][1].curve
+    result = curve.neutral()
+    for scalar, point in terms:
+        result = curve.point_addition(result, affine_multiply(point, scalar))
+    return result
+
+
+def brute_force_count(curve) -> int:
+    """ #E(F_p) по определению: 1 + число решений y^2 = x^3 + a x + b. """
+    p = curve.modulus
+    a, b = int(curve.a), int(curve.b)
+    squares = {}
+    for y in range(p):
+        y_sq = y * y % p
+        squares[y_sq] = squares.get(y_sq, 0) + 1
+    return 1 + sum(
+        squares.get((x * x * x + a * x + b) % p, 0) for x in range(p)
+    )
+
+
+def random_points(curve, count: int) -> list:
+    """ count случайных аффинных точек кривой. """
+    points = []
+    while len(points) < count:
+        candidates = curve.get_point_with_x(RANDOM.randrange(curve.modulus))
+        if candidates is not None:
+            points.append(candidates[RANDOM.randrange(2)])
+    return points
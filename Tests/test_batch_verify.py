@@ -0,0 +1,90 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.keys.private_key import ECPrivateKey
+from ECCBackend.keys.public_key_operations import ecdsa_verify_batch, \
+    ecdsa_verify_hash_batch
+from reference import RANDOM
+
+CURVES = ('secp256k1', 'secp256r1', 'secp112r2')
+
+
+class BatchVerifyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.items = []
+        for name in CURVES:
+            curve = get_curve(name)
+            keys = [ECPrivateKey.generate(curve) for _ in range(3)]
+            for i in range(12):
+                key = keys[i % len(keys)]
+                message = b'%s message %d' % (name.encode(), i)
+                cls.items.append(
+                    (key.pubkey, message, key.ecdsa_sign(message, 'sha256'))
+                )
+
+    def check(self, items, expected):
+        self.assertEqual(ecdsa_verify_batch(items), expected)
+        self.assertEqual(
+            [pubkey.ecdsa_verify(message, signature)
+             for pubkey, message, signature in items],
+            expected
+        )
+
+    def test_all_valid(self):
+        self.check(self.items, [True] * len(self.items))
+
+    def test_one_bad_signature(self):
+        for bad in (0, 5, 17, len(self.items) - 1):
+            items = list(self.items)
+            pubkey, message, signature = items[bad]
+            items[bad] = (pubkey, message + b'!', signature)
+            expected = [True] * len(items)
+            expected[bad] = False
+            self.check(items, expected)
+
+    def test_wrong_key(self):
+        # подписи 3 и 4 сделаны разными ключами одной кривой
+        items = list(self.items)
+        items[3] = (items[4][0], items[3][1], items[3][2])
+        expected = [True] * len(items)
+        expected[3] = False
+        self.check(items, expected)
+
+    def test_recovery_id(self):
+        # неверный или отсутствующий recovery_id не меняет результат
+        items = list(self.items)
+        for index in range(0, len(items), 5):
+            pubkey, message, signature = items[index]
+            if index % 2:
+                signature = signature._replace(recovery_id=None)
+            else:
+                signature = signature._replace(
+                    recovery_id=signature.recovery_id ^ 1
+                )
+            items[index] = (pubkey, message, signature)
+        self.check(items, [True] * len(items))
+
+    def test_out_of_range(self):
+        pubkey, message, signature = self.items[0]
+        order = pubkey.curve.order
+        items = list(self.items[:8])
+        items[2] = (pubkey, message, signature._replace(s=0))
+        items[6] = (pubkey, message, signature._replace(r=order))
+        expected = [True] * len(items)
+        expected[2] = expected[6] = False
+        self.assertEqual(ecdsa_verify_batch(items), expected)
+
+    def test_hash_batch_and_key_method(self):
+        pubkey = self.items[0][0]
+        own = [(message, signature)
+               for key, message, signature in self.items if key is pubkey]
+        self.assertEqual(pubkey.ecdsa_verify_batch(own), [True] * len(own))
+        digests = [(key, RANDOM.randbytes(32), signature)
+                   for key, _, signature in self.items[:6]]
+        self.assertEqual(ecdsa_verify_hash_batch(digests), [False] * 6)
+        self.assertEqual(ecdsa_verify_batch([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
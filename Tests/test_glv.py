@@ -0,0 +1,52 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from reference import RANDOM, affine_multiply, random_points, small_curve, \
+    small_glv_curve
+
+GLV_CURVES = ('secp160k1', 'secp192k1', 'secp224k1', 'secp256k1')
+
+
+class GLVTest(unittest.TestCase):
+    def curves(self):
+        return [small_glv_curve()] + [get_curve(name) for name in GLV_CURVES]
+
+    def test_setup(self):
+        for curve in self.curves():
+            self.assertTrue(curve.has_glv, curve)
+        self.assertFalse(small_curve().has_glv)
+        self.assertFalse(get_curve('secp256r1').has_glv)
+
+    def test_endomorphism_is_lambda(self):
+        for curve in self.curves():
+            lam = curve._glv.lam
+            for point in random_points(curve, 2):
+                self.assertEqual(
+                    curve.endomorphism(point), affine_multiply(point, lam)
+                )
+
+    def test_split(self):
+        for curve in self.curves():
+            n, lam = curve.order, curve._glv.lam
+            for scalar in [0, 1, n - 1] + \
+                    [RANDOM.randrange(n) for _ in range(50)]:
+                k1, k2 = curve.glv_split(scalar)
+                self.assertEqual((k1 + k2 * lam) % n, scalar)
+                # половинная длина с запасом в пару бит
+                bound = n.bit_length() // 2 + 2
+                self.assertLessEqual(abs(k1).bit_length(), bound)
+                self.assertLessEqual(abs(k2).bit_length(), bound)
+
+    def test_multiply(self):
+        for curve in self.curves():
+            n = curve.order
+            for point in random_points(curve, 2):
+                for scalar in [1, 2, n - 1, n, n + 1] + \
+                        [RANDOM.randrange(1, 4 * n) for _ in range(5)]:
+                    self.assertEqual(
+                        point * scalar, affine_multiply(point, scalar)
+                    )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from reference import RANDOM, affine_sum, random_points, small_curve, \
+    small_glv_curve, tiny_curve
+
+
+class MultiScalarTest(unittest.TestCase):
+    def curves(self):
+        return [tiny_curve(), small_curve(), small_glv_curve(),
+                get_curve('secp256r1'), get_curve('secp256k1')]
+
+    def random_terms(self, curve, count: int, bits: int = None):
+        bits = bits or curve.modulus.bit_length() + 2
+        return [(RANDOM.randrange(1 << bits), point)
+                for point in random_points(curve, count)]
+
+    def edge_terms(self, curve):
+        """ Нулевые скаляры, нейтральный элемент, повторы и P, -P. """
+        point, other = random_points(curve, 2)
+        terms = [(0, point), (5, curve.neutral()), (1, point), (3, point),
+                 (7, -point), (RANDOM.randrange(1 << 40), other)]
+        if curve.has_generator:
+            terms.append((RANDOM.randrange(curve.order), curve.gen))
+        return terms
+
+    def check_all_paths(self, terms):
+        curve = terms[0][1].curve
+        expected = affine_sum(terms)
+        self.assertEqual(curve.from_jacobian(curve.jacobian_straus(terms)),
+                         expected)
+        for width in (None, 1, 2, 3, 5, 8):
+            self.assertEqual(
+                curve.from_jacobian(curve.jacobian_pippenger(terms, width)),
+                expected
+            )
+        self.assertEqual(curve.multi_scalar_mul(terms), expected)
+
+    def test_small_batches(self):
+        for curve in self.curves():
+            for count in (1, 2, 5):
+                self.check_all_paths(self.random_terms(curve, count))
+
+    def test_edge_cases(self):
+        for curve in self.curves():
+            self.check_all_paths(self.edge_terms(curve))
+
+    def test_pippenger_threshold(self):
+        # от PIPPENGER_MIN_TERMS слагаемых multi_scalar_mul идёт по корзинам
+        for curve in (small_curve(), small_glv_curve(),
+                      get_curve('secp256r1')):
+            count = curve.PIPPENGER_MIN_TERMS + 3
+            self.check_all_paths(self.random_terms(curve, count, 64))
+
+    def test_empty(self):
+        curve = small_curve()
+        self.assertTrue(curve.multi_scalar_mul([]).is_neutral)
+        self.assertEqual(curve.jacobian_pippenger([]),
+                         curve.JACOBIAN_NEUTRAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
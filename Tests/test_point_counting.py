@@ -0,0 +1,69 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.curves.point_counting import hasse_interval, \
+    mestre_curve_order
+from ECCBackend.curves.weierstrass_curve import WeierstrassCurve
+from reference import RANDOM, tiny_curve
+
+# (a, b, p) от 11 до 22 бит, с a = 0 и b = 0
+CURVES = [
+    (2, 3, 1031), (0, 5, 1549), (4, 0, 3469), (7, 13, 65537),
+    (0, 1, 1000033), (1, 0, 1000037), (123, 456, 4194301),
+]
+
+
+class MestreTest(unittest.TestCase):
+    def test_against_count_points(self):
+        for a, b, p in CURVES:
+            curve = tiny_curve(a, b, p)
+            expected = curve.count_points()
+            low, high = hasse_interval(p)
+            self.assertTrue(low <= expected <= high)
+            self.assertEqual(
+                mestre_curve_order(curve, curve.quadratic_twist()),
+                expected, (a, b, p)
+            )
+
+    def test_starting_congruence(self):
+        for a, b, p in CURVES:
+            curve = tiny_curve(a, b, p)
+            expected = curve.count_points()
+            modulus = RANDOM.choice((2, 3, 5, 7, 12))
+            self.assertEqual(mestre_curve_order(
+                curve, curve.quadratic_twist(), modulus, expected % modulus
+            ), expected)
+
+    def test_twist(self):
+        for a, b, p in CURVES[:4]:
+            curve = tiny_curve(a, b, p)
+            self.assertEqual(
+                curve.count_points() +
+                curve.quadratic_twist().count_points(), 2 * p + 2
+            )
+
+
+class CurveOrderTest(unittest.TestCase):
+    def test_automatic_for_small_moduli(self):
+        for a, b, p in CURVES:
+            curve = tiny_curve(a, b, p)
+            self.assertEqual(curve.curve_order, curve.count_points())
+        curve = get_curve('secp112r1')
+        self.assertEqual(curve.curve_order, curve.order * curve.cofactor)
+
+    def test_explicit_for_large_moduli(self):
+        known = get_curve('secp112r2')
+        curve = WeierstrassCurve(
+            int(known.a), int(known.b), known.modulus,
+            known.order, None, int(known.gen.x), int(known.gen.y)
+        )
+        with self.assertRaises(Exception):
+            curve.curve_order
+        # порядок генератора — делитель #E: BSGS по 4 кандидатам
+        self.assertEqual(curve.compute_curve_order(),
+                         known.order * known.cofactor)
+        self.assertEqual(curve.curve_order, known.order * known.cofactor)
+
+
+if __name__ == '__main__':
+    unittest.main()
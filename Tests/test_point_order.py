@@ -0,0 +1,55 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.curves.point import Point
+from reference import affine_multiply, brute_force_count, random_points, \
+    tiny_curve
+
+
+def reference_order(point, count: int) -> int:
+    """ Наименьший делитель d числа точек count с d * point = O. """
+    return min(d for d in range(1, count + 1)
+               if count % d == 0 and affine_multiply(point, d).is_neutral)
+
+
+class PointOrderTest(unittest.TestCase):
+    def test_every_point_of_small_curves(self):
+        for a, b, p in ((2, 3, 1009), (0, 7, 1051), (3, 0, 1033)):
+            curve = tiny_curve(a, b, p)
+            count = brute_force_count(curve)
+            for point in curve.enumerate_points():
+                self.assertEqual(point.order(), reference_order(point, count))
+
+    def test_cofactor_curve(self):
+        curve = get_curve('secp112r2')
+        self.assertEqual(curve.gen.order(), curve.order)
+        for point in random_points(curve, 10):
+            order = point.order()
+            self.assertIn(order // curve.order, (1, 2, 4))
+            self.assertEqual(order % curve.order, 0)
+            self.assertTrue(affine_multiply(point, order).is_neutral)
+            for q in (2, curve.order):
+                if order % q == 0:
+                    self.assertFalse(
+                        affine_multiply(point, order // q).is_neutral
+                    )
+
+    def test_point_off_curve(self):
+        curve = get_curve('secp112r2')
+        gen = curve.gen
+        point = Point(int(gen.x), int(gen.y) + 1, curve)
+        with self.assertRaises(ValueError):
+            point.order()
+
+    def test_wrong_curve_order(self):
+        # #E, не уничтожающий точку, даёт ValueError, а не зацикливание
+        curve = tiny_curve()
+        point = next(point for point in curve.enumerate_points()
+                     if not point.is_neutral)
+        curve._curve_order = curve.count_points() + 1
+        with self.assertRaises(ValueError):
+            point.order()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from ECCBackend.curves.polynomial import KRONECKER_MIN_LENGTH, \
+    PolynomialModulus, poly_add, poly_divmod, poly_gcd, poly_gcdex, \
+    poly_mul, poly_sqr, poly_trim
+from reference import RANDOM
+
+P = (1 << 61) - 1
+
+
+def random_poly(length: int, p: int = P) -> list:
+    poly = [RANDOM.randrange(p) for _ in range(length)]
+    if poly:
+        poly[-1] = RANDOM.randrange(1, p)
+    return poly
+
+
+def schoolbook(a: list, b: list, p: int = P) -> list:
+    if not a or not b:
+        return []
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            result[i + j] = (result[i + j] + x * y) % p
+    return poly_trim(result)
+
+
+class PolynomialTest(unittest.TestCase):
+    def test_mul_and_sqr(self):
+        lengths = (0, 1, 2, KRONECKER_MIN_LENGTH - 1, KRONECKER_MIN_LENGTH,
+                   KRONECKER_MIN_LENGTH + 1, 70)
+        for m in lengths:
+            for n in lengths:
+                a, b = random_poly(m), random_poly(n)
+                self.assertEqual(poly_mul(a, b, P), schoolbook(a, b))
+            a = random_poly(m)
+            self.assertEqual(poly_sqr(a, P), schoolbook(a, a))
+        # малый модуль: ячейки Кронекера шириной в один байт
+        a, b = random_poly(40, 7), random_poly(33, 7)
+        self.assertEqual(poly_mul(a, b, 7), schoolbook(a, b, 7))
+
+    def test_divmod_and_gcd(self):
+        for m, n in ((30, 7), (7, 30), (50, 50), (65, 1)):
+            a, b = random_poly(m), random_poly(n)
+            q, r = poly_divmod(a, b, P)
+            self.assertLess(len(r), len(b))
+            self.assertEqual(poly_add(poly_mul(q, b, P), r, P), a)
+        common = random_poly(6)
+        a = poly_mul(common, random_poly(20), P)
+        b = poly_mul(common, random_poly(25), P)
+        g = poly_gcd(a, b, P)
+        self.assertEqual(poly_divmod(g, common, P)[1], [])
+        g, s = poly_gcdex(a, b, P)
+        self.assertEqual(poly_divmod(poly_mul(s, a, P), b, P)[1], g)
+
+    def test_modulus(self):
+        for degree in (1, 5, KRONECKER_MIN_LENGTH + 3, 60):
+            h = random_poly(degree + 1)
+            ring = PolynomialModulus(h, P)
+            for length in (0, degree, degree + 1, 2 * degree, 2 * degree + 1,
+                           3 * degree + 5):
+                a = random_poly(length)
+                self.assertEqual(ring.reduce(a),
+                                 poly_divmod(a, ring.modulus, P)[1])
+            a, g = ring.reduce(random_poly(degree + 4)), random_poly(45)
+            power = [1]
+            for _ in range(11):
+                power = ring.mul(power, a)
+            self.assertEqual(ring.pow(a, 11), power)
+            # g(a) схемой Горнера
+            horner = []
+            for c in reversed(g):
+                horner = poly_add(ring.mul(horner, a), [c], P)
+            self.assertEqual(ring.compose(g, a), horner)
+
+
+if __name__ == '__main__':
+    unittest.main()
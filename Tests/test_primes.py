@@ -0,0 +1,58 @@
+import unittest
+
+from ECCBackend.primes import TRIAL_DIVISION_BOUND, factorize, \
+    is_probable_prime, pollard_rho, random_prime
+from reference import RANDOM
+
+
+def trial_division(n: int) -> dict:
+    factors = {}
+    divisor = 2
+    while divisor * divisor <= n:
+        while n % divisor == 0:
+            factors[divisor] = factors.get(divisor, 0) + 1
+            n //= divisor
+        divisor += 1
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+class PollardRhoTest(unittest.TestCase):
+    def test_semiprimes(self):
+        for bits in (16, 24, 32):
+            for _ in range(3):
+                p, q = random_prime(bits), random_prime(bits)
+                divisor = pollard_rho(p * q)
+                self.assertIn(divisor, (p, q))
+
+    def test_divisor(self):
+        for _ in range(30):
+            n = RANDOM.randrange(256, 1 << 40)
+            if is_probable_prime(n):
+                continue
+            divisor = pollard_rho(n)
+            self.assertTrue(1 < divisor < n and n % divisor == 0, n)
+
+
+class FactorizeTest(unittest.TestCase):
+    def test_against_trial_division(self):
+        numbers = [1, 2, 12, 1 << 20, TRIAL_DIVISION_BOUND ** 2 - 1,
+                   3 ** 7 * 5 ** 3 * 65537] + \
+            [RANDOM.randrange(2, 1 << 36) for _ in range(50)]
+        for n in numbers:
+            self.assertEqual(factorize(n), trial_division(n), n)
+
+    def test_large_factors(self):
+        primes = [random_prime(32), random_prime(36), random_prime(24)]
+        n = primes[0] ** 2 * primes[1] * primes[2] * 720
+        expected = {2: 4, 3: 2, 5: 1}
+        for q, e in zip(primes, (2, 1, 1)):
+            expected[q] = expected.get(q, 0) + e
+        factors = factorize(n)
+        self.assertEqual(factors, expected)
+        self.assertEqual(list(factors), sorted(factors))
+
+
+if __name__ == '__main__':
+    unittest.main()
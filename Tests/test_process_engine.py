@@ -0,0 +1,58 @@
+import multiprocessing
+import unittest
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.keys.private_key import ECPrivateKey
+from ECCBackend.keys.process_engine import ProcessEngine
+
+
+class ProcessEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.curves = [get_curve('secp256r1'), get_curve('secp112r2')]
+        cls.keys = [ECPrivateKey.generate(curve) for curve in cls.curves]
+        # spawn: процессы не наследуют потоки и состояние тестов
+        cls.engine = ProcessEngine(
+            cls.curves, max_workers=2, chunk_size=3,
+            precompute_keys=[cls.keys[0].pubkey],
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.close()
+
+    def test_sign_and_verify(self):
+        items = []
+        for key in self.keys:
+            messages = [b'message %d' % i for i in range(10)]
+            signatures = list(
+                self.engine.sign_many(key, messages, 'sha256')
+            )
+            self.assertEqual(len(signatures), len(messages))
+            for message, signature in zip(messages, signatures):
+                self.assertTrue(key.pubkey.ecdsa_verify(message, signature))
+                items.append((key.pubkey, message, signature))
+        bad = 7
+        items[bad] = (items[bad][0], b'other', items[bad][2])
+        expected = [True] * len(items)
+        expected[bad] = False
+        self.assertEqual(list(self.engine.verify_many(items)), expected)
+
+    def test_ecdh(self):
+        for key in self.keys:
+            peers = [ECPrivateKey.generate(key.curve).pubkey
+                     for _ in range(7)]
+            self.assertEqual(
+                list(self.engine.ecdh_many(key, peers)),
+                [key.ecdh_compute(peer) for peer in peers]
+            )
+
+    def test_unregistered_curve(self):
+        key = ECPrivateKey.generate(get_curve('secp256k1'))
+        with self.assertRaises(ValueError):
+            list(self.engine.sign_many(key, [b'message'], 'sha256'))
+
+
+if __name__ == '__main__':
+    unittest.main()
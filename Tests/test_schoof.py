@@ -0,0 +1,85 @@
+import multiprocessing
+import unittest
+from unittest import mock
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.curves import schoof
+from ECCBackend.curves.schoof import SCHOOF_MAX_BITS, division_polynomials, \
+    schoof_curve_order, schoof_primes, trace_mod_prime
+from ECCBackend.curves.weierstrass_curve import WeierstrassCurve
+from reference import affine_multiply, tiny_curve
+
+# (a, b, p) от 10 до 20 бит, с a = 0 и b = 0
+CURVES = [
+    (2, 3, 1009), (0, 5, 1549), (4, 0, 3469), (7, 13, 65537),
+    (123, 456, 1000003),
+]
+
+
+def evaluate(poly: list, x: int, p: int) -> int:
+    value = 0
+    for c in reversed(poly):
+        value = (value * x + c) % p
+    return value
+
+
+class SchoofTest(unittest.TestCase):
+    def test_division_polynomials(self):
+        # нули psi_l при нечётном l — абсциссы точек l-кручения
+        a, b, p = 2, 3, 1009
+        curve = tiny_curve(a, b, p)
+        polys = division_polynomials(a, b, p, 7)
+        for point in curve.enumerate_points():
+            if point.is_neutral or int(point.y) == 0:
+                continue
+            for ell in (3, 5, 7):
+                torsion = affine_multiply(point, ell).is_neutral
+                self.assertEqual(
+                    evaluate(polys[ell], int(point.x), p) == 0, torsion
+                )
+
+    def test_trace_mod_prime(self):
+        for a, b, p in CURVES:
+            trace = p + 1 - tiny_curve(a, b, p).count_points()
+            for ell in (2, 3, 5, 7, 11, 13):
+                self.assertEqual(trace_mod_prime(a, b, p, ell),
+                                 trace % ell, (a, b, p, ell))
+
+    def test_schoof_curve_order(self):
+        # меньше кандидатов для BSGS — больше простых l даже на малых p
+        with mock.patch.object(schoof, 'SCHOOF_BSGS_CANDIDATES', 8):
+            for a, b, p in CURVES[2:]:
+                curve = tiny_curve(a, b, p)
+                self.assertGreater(len(schoof_primes(p)), 2)
+                self.assertEqual(schoof_curve_order(curve),
+                                 curve.count_points(), (a, b, p))
+
+    def test_worker_processes(self):
+        a, b, p = CURVES[-1]
+        curve = tiny_curve(a, b, p)
+        with mock.patch.object(schoof, 'SCHOOF_BSGS_CANDIDATES', 8):
+            order = schoof_curve_order(
+                curve, max_workers=2,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        self.assertEqual(order, curve.count_points())
+
+    def test_curve_order_64_bits(self):
+        # 2^64 - 59; #E проверяется порядком случайной точки
+        curve = WeierstrassCurve(3, 7, (1 << 64) - 59,
+                                 None, None, None, None)
+        order = curve.curve_order
+        point = curve.get_point_with_x(1) or curve.get_point_with_x(2)
+        self.assertTrue(affine_multiply(point[0], order).is_neutral)
+
+    def test_too_large_modulus(self):
+        known = get_curve('secp192r1')
+        self.assertGreater(known.modulus.bit_length(), SCHOOF_MAX_BITS)
+        curve = WeierstrassCurve(int(known.a), int(known.b), known.modulus,
+                                 None, None, None, None)
+        with self.assertRaises(ValueError):
+            curve.compute_curve_order()
+
+
+if __name__ == '__main__':
+    unittest.main()
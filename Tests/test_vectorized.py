@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from ECCData.preset_curves import get_curve
+from ECCBackend.curves import weierstrass_curve
+from ECCBackend.curves.vectorized import numpy_supports
+from reference import brute_force_count, tiny_curve
+
+# (a, b, p): p = 1 и 3 mod 4, 65537 — 2^16 | p - 1 для Тонелли — Шэнкса,
+# a = 0 и b = 0
+CURVES = [
+    (2, 3, 1009), (5, 7, 1019), (0, 7, 10007), (3, 0, 10009),
+    (1, 1, 65537), (-3, 11, 65521),
+]
+
+
+@unittest.skipUnless(numpy_supports(65537), 'NumPy is not installed')
+class VectorizedCountTest(unittest.TestCase):
+    def test_count_points(self):
+        for a, b, p in CURVES:
+            curve = tiny_curve(a, b, p)
+            expected = brute_force_count(curve)
+            for chunk_size in (1000, 1 << 16):
+                self.assertEqual(curve.count_points(chunk_size), expected,
+                                 (a, b, p, chunk_size))
+
+    def test_point_arrays(self):
+        for a, b, p in CURVES[:4]:
+            curve = tiny_curve(a, b, p)
+            points = set()
+            for xs, ys in curve.point_arrays(chunk_size=777):
+                points.update(zip(xs.tolist(), ys.tolist()))
+            self.assertTrue(all(curve.point(x, y).on_curve()
+                                for x, y in points))
+            self.assertEqual(points, {
+                (int(point.x), int(point.y))
+                for point in curve.enumerate_points()
+                if not point.is_neutral
+            })
+            self.assertEqual(len(points) + 1, brute_force_count(curve))
+
+    def test_point_arrays_needs_small_modulus(self):
+        with self.assertRaises(ValueError):
+            get_curve('secp112r1').point_arrays()
+
+
+class PythonCountTest(unittest.TestCase):
+    def test_count_points_without_numpy(self):
+        with mock.patch.object(weierstrass_curve, 'numpy_supports',
+                               return_value=False):
+            for a, b, p in CURVES[:4]:
+                curve = tiny_curve(a, b, p)
+                self.assertEqual(curve.count_points(500),
+                                 brute_force_count(curve))
+
+    def test_enumerate_points(self):
+        for a, b, p in CURVES[:4]:
+            curve = tiny_curve(a, b, p)
+            points = list(curve.enumerate_points())
+            self.assertEqual(len(points), brute_force_count(curve))
+            self.assertTrue(all(point.on_curve() for point in points))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from ECCData.preset_curves import get_curve
+from reference import RANDOM, affine_multiply, random_points, small_curve, \
+    tiny_curve
+
+
+class XOnlyLadderTest(unittest.TestCase):
+    def check(self, point, scalar):
+        expected = affine_multiply(point, scalar)
+        curve = point.curve
+        x = curve.x_only_multiply(int(point.x), scalar)
+        if expected.is_neutral:
+            self.assertIsNone(x)
+        else:
+            self.assertEqual(x, int(expected.x))
+        self.assertEqual(curve.x_only_multiply_point(point, scalar), expected)
+
+    def test_every_point_of_tiny_curve(self):
+        # на кривой есть точки второго порядка и точки с x = 0
+        curve = tiny_curve()
+        for point in curve.enumerate_points():
+            if point.is_neutral:
+                continue
+            for scalar in (1, 2, 3, 7, 534, 1067, 1068, 1069):
+                self.check(point, scalar)
+
+    def test_random_scalars(self):
+        for curve in (small_curve(), get_curve('secp112r2'),
+                      get_curve('secp256r1'), get_curve('secp256k1')):
+            for point in random_points(curve, 3):
+                for _ in range(5):
+                    self.check(point, RANDOM.randrange(1, 1 << 260))
+
+    def test_zero_scalar(self):
+        curve = small_curve()
+        self.assertIsNone(curve.x_only_multiply(int(curve.gen.x), 0))
+        self.assertTrue(curve.x_only_multiply_point(curve.gen, 0).is_neutral)
+
+    def test_rejects_x_without_point(self):
+        curve = tiny_curve()
+        x = next(x for x in range(curve.modulus)
+                 if curve.get_point_with_x(x) is None)
+        with self.assertRaises(ValueError):
+            curve.x_only_multiply(x, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()